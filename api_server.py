@@ -0,0 +1,318 @@
+# api_server.py  ───────────────────────────────────────────────────────────
+"""
+Optional read-only HTTP API over roster.db (asyncio, standard library only).
+
+    GET /health
+    GET /staff                       names, max hours, unavailable days
+    GET /rosters                     all rosters, newest first (incl. archived)
+    GET /rosters/<id>                roster + its duties
+    GET /rosters/<id>/hours          weekly hours per employee
+    GET /rosters/<id>/pdf            the roster PDF
+    GET /shifts?employee=<name>      upcoming shifts (latest revision of each week)
+
+Responses are kept in an in-memory cache.  The dashboard bumps a change
+counter (``roster_data.bump_epoch``) on finalize and on staff changes; a
+background task notices it through ``PRAGMA data_version`` and drops only the
+affected part of the cache.  Cache hits never touch SQLite, so a single core
+serves hundreds of concurrent readers; misses run on one DB thread and
+concurrent misses for the same URL share a single query.  PDFs are cached as
+their path only and streamed from Rosters/ in chunks, so the cache stays a
+few MB however many rosters are requested.
+
+Run it next to the app (e.g. for the break-room tablet):
+    python api_server.py --host 0.0.0.0 --port 8080
+"""
+
+import os, json, asyncio, argparse, datetime
+from collections import OrderedDict, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit, parse_qs, unquote
+import archive
+import roster_data
+
+BASE_DIR       = os.path.dirname(os.path.abspath(__file__))
+DB_FILE        = os.path.join(BASE_DIR, "roster.db")
+ROSTERS_DIR    = os.path.join(BASE_DIR, "Rosters")
+CACHE_ENTRIES  = 512        # LRU bound on cached responses
+EPOCH_POLL     = 0.5        # seconds between change checks
+MAX_HEADER     = 16 * 1024
+FILE_CHUNK     = 64 * 1024  # PDF streaming block size
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found",
+           405: "Method Not Allowed", 500: "Internal Server Error"}
+
+
+PdfFile = namedtuple("PdfFile", "path")     # cached in place of the PDF bytes
+
+
+class HttpError(Exception):
+    def __init__(self, status, message=None):
+        super().__init__(message or REASONS[status])
+        self.status = status
+
+
+class RosterAPI:
+    """Routes + cache.  All SQLite access happens on ``self.db`` (one thread)."""
+
+    def __init__(self, db_file=DB_FILE):
+        self.db_file = db_file
+        self.db      = ThreadPoolExecutor(max_workers=1, thread_name_prefix="api-db")
+        self.con     = None
+        self.cache   = OrderedDict()      # (scope, key, day) → (status, ctype, body | PdfFile)
+        self.pending = {}                 # key → Future (single-flight misses)
+        self.epochs, self.data_version = {}, None
+
+    # ─────────────── database thread ─────────────────────────────────────
+    def _open(self):
+        archive.setup(self.db_file)                 # once per server start – reads do no DDL
+        self.con = archive.connect(self.db_file, check_same_thread=False, timeout=5)
+        roster_data.ensure_epoch_schema(self.con); self.con.commit()
+        self.epochs = roster_data.read_epochs(self.con)
+        self.data_version = self.con.execute("PRAGMA data_version").fetchone()[0]
+
+    def _changed_scopes(self):
+        """Scopes whose epoch moved since the last check (cheap when nothing did)."""
+        dv = self.con.execute("PRAGMA data_version").fetchone()[0]
+        if dv == self.data_version:
+            return set()
+        if archive.stale(self.con, self.db_file):     # first archiving created the archive file
+            self.con.close()
+            self.con = archive.connect(self.db_file, check_same_thread=False, timeout=5)
+            dv = self.con.execute("PRAGMA data_version").fetchone()[0]
+        self.data_version = dv
+        epochs = roster_data.read_epochs(self.con)
+        changed = {s for s in set(epochs) | set(self.epochs) if epochs.get(s) != self.epochs.get(s)}
+        self.epochs = epochs
+        return changed
+
+    async def run_db(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self.db, fn, *args)
+
+    async def watch(self):
+        """Background task: drop cached responses when the dashboard changes data."""
+        while True:
+            await asyncio.sleep(EPOCH_POLL)
+            try:
+                changed = await self.run_db(self._changed_scopes)
+            except Exception as e:
+                print(f"Change check failed: {e}"); continue
+            if changed:
+                for key in [k for k in self.cache if k[0] in changed]:
+                    del self.cache[key]
+
+    # ─────────────── queries (DB thread) ─────────────────────────────────
+    def q_staff(self):
+        return [dict(name=n, max_hours=m, days_unavailable=[d for d in (du or "").split(",") if d])
+                for n, m, du in self.con.execute(
+                    "SELECT name,max_hours,days_unavailable FROM staff ORDER BY name")]
+
+    def q_rosters(self):
+        cols = ("roster_id", "start_date", "end_date", "created_at", "archived")
+        return [dict(zip(cols, r)) for r in self.con.execute(
+            """SELECT roster_id,start_date,end_date,created_at,archived
+                 FROM all_roster ORDER BY created_at DESC""")]
+
+    def _roster_row(self, rid):
+        row = self.con.execute("""SELECT roster_id,start_date,end_date,created_at,archived,pdf_file
+                                    FROM all_roster WHERE roster_id=?""", (rid,)).fetchone()
+        if not row:
+            raise HttpError(404, f"No roster {rid}")
+        return row
+
+    def q_roster(self, rid):
+        r = self._roster_row(rid)
+        duties = [dict(date=d.duty_date, employee=d.employee, start=d.start, end=d.end,
+                       hours=round(roster_data.duration_hours(d.start, d.end), 2), note=d.note or "")
+                  for d in roster_data.iter_duties(self.con, rid)]
+        return dict(roster_id=r[0], start_date=r[1], end_date=r[2], created_at=r[3],
+                    archived=bool(r[4]), duties=duties)
+
+    def q_hours(self, rid):
+        self._roster_row(rid)
+        tot = {}
+        for d in roster_data.iter_duties(self.con, rid):
+            tot[d.employee] = tot.get(d.employee, 0.0) + roster_data.duration_hours(d.start, d.end)
+        return {e: round(h, 2) for e, h in sorted(tot.items())}
+
+    def q_pdf(self, rid):
+        rel = self._roster_row(rid)[5]
+        path = os.path.join(ROSTERS_DIR, rel) if rel else None
+        if not path or not os.path.isfile(path):
+            raise HttpError(404, f"No PDF for roster {rid}")
+        return PdfFile(path)                  # content-addressed (pdf_store): the path is enough
+
+    def q_shifts(self, employee, today):
+        cols = ("date", "start", "end", "note")
+        return [dict(zip(cols, r)) for r in self.con.execute(
+            """SELECT d.duty_date,d.start_time,d.end_time,d.note
+                 FROM all_roster_duties d
+                WHERE d.employee=? AND d.duty_date>=?
+                  AND d.roster_id IN (SELECT MAX(roster_id) FROM all_roster GROUP BY start_date)
+                ORDER BY d.duty_date,d.start_time""", (employee, today))]
+
+    # ─────────────── routing ─────────────────────────────────────────────
+    def route(self, path, query, today):
+        """→ (cache scope, loader, content type); ``today`` is the ISO date of the request."""
+        parts = [unquote(p) for p in path.strip("/").split("/") if p]
+        if parts == ["health"]:
+            return None, lambda: {"status": "ok"}, "json"
+        if parts == ["staff"]:
+            return "staff", self.q_staff, "json"
+        if parts == ["rosters"]:
+            return "roster", self.q_rosters, "json"
+        if parts == ["shifts"]:
+            emp = query.get("employee", [""])[0]
+            if not emp:
+                raise HttpError(400, "employee parameter required")
+            return "roster", lambda: self.q_shifts(emp, today), "json"
+        if len(parts) in (2, 3) and parts[0] == "rosters":
+            try:
+                rid = int(parts[1])
+            except ValueError:
+                raise HttpError(404)
+            sub = parts[2] if len(parts) == 3 else ""
+            loader = {"": self.q_roster, "hours": self.q_hours, "pdf": self.q_pdf}.get(sub)
+            if loader:
+                return "roster", lambda: loader(rid), "pdf" if sub == "pdf" else "json"
+        raise HttpError(404)
+
+    async def get(self, target):
+        """Cached response ``(status, content_type, body)`` for a GET target."""
+        url = urlsplit(target)
+        today = datetime.date.today().isoformat()
+        scope, loader, kind = self.route(url.path, parse_qs(url.query), today)
+        # /shifts is "from today on": the date is part of the key, so nothing cached
+        # yesterday is served today (old entries just age out of the LRU)
+        key = (scope, url.path.rstrip("/") + "?" + url.query, today)
+        if scope and key in self.cache:
+            self.cache.move_to_end(key)
+            return self.cache[key]
+        if key in self.pending:                   # same miss already in flight
+            return await asyncio.shield(self.pending[key])
+
+        fut = asyncio.get_running_loop().create_future()
+        self.pending[key] = fut
+        try:
+            data = await self.run_db(loader)
+            if kind == "pdf":
+                resp = (200, "application/pdf", data)
+            else:
+                resp = (200, "application/json; charset=utf-8",
+                        json.dumps(data, ensure_ascii=False).encode("utf-8"))
+            if scope:
+                self.cache[key] = resp
+                while len(self.cache) > CACHE_ENTRIES:
+                    self.cache.popitem(last=False)
+            fut.set_result(resp)
+            return resp
+        except BaseException as e:
+            fut.set_exception(e)
+            fut.exception()                       # mark retrieved when nobody waits
+            raise
+        finally:
+            del self.pending[key]
+
+    # ─────────────── HTTP/1.1 ────────────────────────────────────────────
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    return
+                except asyncio.LimitOverrunError:
+                    await self.respond(writer, 400, "text/plain", b"Header too large", False)
+                    return
+                lines = head.decode("latin-1").split("\r\n")
+                try:
+                    method, target, version = lines[0].split(" ", 2)
+                except ValueError:
+                    await self.respond(writer, 400, "text/plain", b"Bad request line", False)
+                    return
+                headers = {k.strip().lower(): v.strip()
+                           for k, _, v in (l.partition(":") for l in lines[1:] if l)}
+                conn_hdr = headers.get("connection", "").lower()
+                keep = conn_hdr != "close" if version == "HTTP/1.1" else conn_hdr == "keep-alive"
+
+                if method not in ("GET", "HEAD"):
+                    status, ctype, body = 405, "text/plain", b"Only GET is supported"
+                else:
+                    try:
+                        status, ctype, body = await self.get(target)
+                        if isinstance(body, PdfFile):
+                            await self.send_file(writer, ctype, body, keep, head_only=method == "HEAD")
+                            if not keep:
+                                return
+                            continue
+                    except HttpError as e:
+                        status, ctype = e.status, "application/json; charset=utf-8"
+                        body = json.dumps({"error": str(e)}).encode("utf-8")
+                    except Exception as e:
+                        print(f"{method} {target} failed: {e}")
+                        status, ctype, body = 500, "application/json; charset=utf-8", \
+                                              json.dumps({"error": "internal error"}).encode("utf-8")
+                await self.respond(writer, status, ctype, body, keep, head_only=method == "HEAD")
+                if not keep:
+                    return
+        finally:
+            writer.close()
+
+    async def send_file(self, writer, ctype, pdf, keep, head_only=False):
+        """Stream a cached PDF from disk; 404 (and forget it) if the file has gone."""
+        loop = asyncio.get_running_loop()
+        try:
+            fh = await loop.run_in_executor(None, open, pdf.path, "rb")
+        except OSError:
+            for key in [k for k, v in self.cache.items() if v[2] == pdf]:
+                del self.cache[key]
+            raise HttpError(404, "PDF file missing")
+        try:
+            await self.respond(writer, 200, ctype, b"", keep, head_only=True,
+                               length=os.fstat(fh.fileno()).st_size)
+            while not head_only:
+                chunk = await loop.run_in_executor(None, fh.read, FILE_CHUNK)
+                if not chunk:
+                    break
+                writer.write(chunk)
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            fh.close()
+
+    async def respond(self, writer, status, ctype, body, keep, head_only=False, length=None):
+        hdr = (f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+               f"Content-Type: {ctype}\r\n"
+               f"Content-Length: {len(body) if length is None else length}\r\n"
+               f"Connection: {'keep-alive' if keep else 'close'}\r\n"
+               "Access-Control-Allow-Origin: *\r\n\r\n")
+        writer.write(hdr.encode("latin-1") + (b"" if head_only else body))
+        try:
+            await writer.drain()
+        except ConnectionError:
+            pass
+
+
+async def serve(host="127.0.0.1", port=8080, *, db_file=DB_FILE):
+    api = RosterAPI(db_file)
+    await api.run_db(api._open)
+    server = await asyncio.start_server(api.handle, host, port, limit=MAX_HEADER)
+    watcher = asyncio.create_task(api.watch())
+    print(f"[✔] Roster API on http://{host}:{port}/  (db: {db_file})")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        watcher.cancel()
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Read-only HTTP API over the roster database")
+    ap.add_argument("--host", default="127.0.0.1", help="0.0.0.0 to allow other devices")
+    ap.add_argument("--port", type=int, default=8080)
+    ap.add_argument("--db", default=DB_FILE)
+    args = ap.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port, db_file=args.db))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,290 @@
+# archive.py  ──────────────────────────────────────────────────────────────
+"""
+Archive tiering and housekeeping for roster history.
+
+Rosters that ended more than ``ARCHIVE_DAYS`` ago are moved – roster row and
+duties – into a separate SQLite file (``roster_archive.db``).  The live
+roster.db keeps one compact row per archived roster in ``roster_summary``
+(dates, PDF, duty/employee counts, total hours), so the history dropdown
+never has to open the archive.
+
+``setup()`` creates/upgrades the main-DB tables (and an existing archive's);
+it runs once at dashboard launch.  roster_archive.db itself is only created
+by ``archive_old()`` when there is something to move.  ``connect()`` only
+ATTACHes the archive and defines two TEMP views that span both files:
+
+    all_roster         – main.roster ∪ main.roster_summary   (+ archived flag)
+    all_roster_duties  – main.roster_duties ∪ archive.roster_duties
+
+History readers (dashboard history, exporters, mailer, …) query those views
+and never need to know where a roster lives.
+
+``run_scheduled()`` archives and then runs incremental VACUUM + ANALYZE at
+most once per ``MAINTENANCE_DAYS``; the dashboard calls it on a background
+thread at login.
+
+Command line:
+    python archive.py run     [--days N]     archive + maintenance now
+    python archive.py vacuum  [--full]       --full converts an old DB to
+                                             incremental auto-vacuum (one-off)
+    python archive.py status
+"""
+
+import os, sqlite3, datetime, argparse
+import pdf_store
+import roster_data
+
+BASE_DIR         = os.path.dirname(os.path.abspath(__file__))
+DB_FILE          = os.path.join(BASE_DIR, "roster.db")
+ARCHIVE_FILE     = os.path.join(BASE_DIR, "roster_archive.db")
+ARCHIVE_DAYS     = int(os.environ.get("ROSTER_ARCHIVE_DAYS", "365"))
+MAINTENANCE_DAYS = 7
+VACUUM_PAGES     = 2000     # pages released per incremental vacuum step
+
+# duty minutes, wrapping past midnight like roster_data.duration_hours
+_MINUTES = ("((CAST(substr(d.end_time,1,2) AS INTEGER)*60 + CAST(substr(d.end_time,4,2) AS INTEGER))"
+            " - (CAST(substr(d.start_time,1,2) AS INTEGER)*60 + CAST(substr(d.start_time,4,2) AS INTEGER))"
+            " + 1440) % 1440")
+
+
+def ensure_schema(con):
+    """Main-DB tables used by the archive (summary + maintenance bookkeeping)."""
+    pdf_store.ensure_schema(con)            # roster.pdf_hash is copied along
+    con.execute("""
+        CREATE TABLE IF NOT EXISTS main.roster_summary (
+            roster_id      INTEGER PRIMARY KEY,
+            start_date     TEXT,
+            end_date       TEXT,
+            pdf_file       TEXT,
+            pdf_hash       TEXT,
+            created_at     TEXT,
+            duty_count     INTEGER,
+            employee_count INTEGER,
+            total_hours    REAL,
+            archived_at    TEXT
+        )
+    """)
+    con.execute("""
+        CREATE TABLE IF NOT EXISTS main.maintenance (
+            task     TEXT PRIMARY KEY,
+            last_run TEXT
+        )
+    """)
+    con.execute("CREATE INDEX IF NOT EXISTS main.idx_roster_duties_roster "
+                "ON roster_duties(roster_id)")
+    con.commit()
+
+
+def _ensure_archive_schema(con):
+    con.execute("""
+        CREATE TABLE IF NOT EXISTS archive.roster (
+            roster_id   INTEGER PRIMARY KEY,
+            start_date  TEXT,
+            end_date    TEXT,
+            pdf_file    TEXT,
+            pdf_hash    TEXT,
+            created_at  TEXT,
+            archived_at TEXT
+        )
+    """)
+    con.execute("""
+        CREATE TABLE IF NOT EXISTS archive.roster_duties (
+            roster_id  INTEGER,
+            duty_date  TEXT,
+            employee   TEXT,
+            start_time TEXT,
+            end_time   TEXT,
+            note       TEXT
+        )
+    """)
+    con.execute("CREATE INDEX IF NOT EXISTS archive.idx_archive_duties_roster "
+                "ON roster_duties(roster_id)")
+    con.commit()
+
+
+def archive_path(db_file=DB_FILE):
+    """The archive lives next to its roster.db."""
+    if os.path.abspath(db_file) == os.path.abspath(DB_FILE):
+        return ARCHIVE_FILE
+    return os.path.join(os.path.dirname(os.path.abspath(db_file)), os.path.basename(ARCHIVE_FILE))
+
+
+def setup(db_file=DB_FILE, archive_file=None, *, create_archive=False):
+    """Create/upgrade the main-DB tables, and the archive's if it exists (idempotent).
+
+    The archive file is only created with ``create_archive=True``.
+    """
+    path = archive_file or archive_path(db_file)
+    con = sqlite3.connect(db_file)
+    try:
+        ensure_schema(con)
+        if create_archive or os.path.exists(path):
+            con.execute("ATTACH DATABASE ? AS archive", (path,))
+            _ensure_archive_schema(con)
+    finally:
+        con.close()
+
+
+def connect(db_file=DB_FILE, archive_file=None, **kw):
+    """SQLite connection to roster.db with the archive attached and cross-DB views.
+
+    No DDL on disk: the tables come from ``setup()``.  Until the first roster
+    is archived there is no archive file, and an empty in-memory stand-in is
+    attached instead, so readers never create one.  A roster.db the dashboard
+    has not upgraded yet (no roster_summary / pdf_hash) still reads fine.
+    Long-lived connections should check ``stale()`` and reconnect.
+    """
+    path = archive_file or archive_path(db_file)
+    con = sqlite3.connect(db_file, **kw)
+    if os.path.exists(path):
+        con.execute("ATTACH DATABASE ? AS archive", (path,))
+    else:
+        con.execute("ATTACH DATABASE ':memory:' AS archive")
+        _ensure_archive_schema(con)
+    tables = {n for n, in con.execute("SELECT name FROM main.sqlite_master WHERE type='table'")}
+    pdf_hash = "pdf_hash" if any(c[1] == "pdf_hash" for c in con.execute("PRAGMA main.table_info(roster)")) \
+               else "NULL AS pdf_hash"
+    summary = """
+            UNION ALL
+            SELECT roster_id,start_date,end_date,pdf_file,pdf_hash,created_at,1
+              FROM main.roster_summary""" if "roster_summary" in tables else ""
+    con.execute(f"""
+        CREATE TEMP VIEW IF NOT EXISTS all_roster AS
+            SELECT roster_id,start_date,end_date,pdf_file,{pdf_hash},created_at,0 AS archived
+              FROM main.roster{summary}
+    """)
+    con.execute("""
+        CREATE TEMP VIEW IF NOT EXISTS all_roster_duties AS
+            SELECT roster_id,duty_date,employee,start_time,end_time,note FROM main.roster_duties
+            UNION ALL
+            SELECT roster_id,duty_date,employee,start_time,end_time,note FROM archive.roster_duties
+    """)
+    return con
+
+
+def stale(con, db_file=DB_FILE, archive_file=None):
+    """True if ``con`` was opened before the archive file existed (reconnect to see it)."""
+    attached = {name: f for _, name, f in con.execute("PRAGMA database_list")}
+    return not attached.get("archive") and os.path.exists(archive_file or archive_path(db_file))
+
+
+# ─────────────────────────── archiving ────────────────────────────────────
+def archive_old(*, days=ARCHIVE_DAYS, db_file=DB_FILE, archive_file=None):
+    """Move rosters that ended more than ``days`` ago into the archive; returns their ids."""
+    cutoff = (datetime.date.today() - datetime.timedelta(days=days)).isoformat()
+    with sqlite3.connect(db_file) as con:
+        ids = [r for r, in con.execute(
+            "SELECT roster_id FROM main.roster WHERE end_date < ? ORDER BY roster_id", (cutoff,))]
+    con.close()
+    if not ids:
+        return []
+    setup(db_file, archive_file, create_archive=True)     # first archiving creates the file
+    con = connect(db_file, archive_file)
+    try:
+        with con:                               # one transaction across both files
+            con.execute("CREATE TEMP TABLE _archiving(roster_id INTEGER PRIMARY KEY)")
+            con.executemany("INSERT INTO _archiving VALUES(?)", [(r,) for r in ids])
+            sel = "roster_id IN (SELECT roster_id FROM _archiving)"
+            con.execute(f"""INSERT OR REPLACE INTO archive.roster
+                            SELECT roster_id,start_date,end_date,pdf_file,pdf_hash,created_at,
+                                   CURRENT_TIMESTAMP
+                              FROM main.roster WHERE {sel}""")
+            con.execute(f"DELETE FROM archive.roster_duties WHERE {sel}")   # re-run safety
+            con.execute(f"""INSERT INTO archive.roster_duties
+                            SELECT roster_id,duty_date,employee,start_time,end_time,note
+                              FROM main.roster_duties WHERE {sel}""")
+            con.execute(f"""INSERT OR REPLACE INTO main.roster_summary
+                            SELECT r.roster_id,r.start_date,r.end_date,r.pdf_file,r.pdf_hash,
+                                   r.created_at,COUNT(d.roster_id),COUNT(DISTINCT d.employee),
+                                   COALESCE(SUM({_MINUTES}),0)/60.0,CURRENT_TIMESTAMP
+                              FROM main.roster r
+                              LEFT JOIN main.roster_duties d ON d.roster_id=r.roster_id
+                             WHERE r.{sel}
+                             GROUP BY r.roster_id""")
+            con.execute(f"DELETE FROM main.roster_duties WHERE {sel}")
+            con.execute(f"DELETE FROM main.roster WHERE {sel}")
+            con.execute("DROP TABLE _archiving")
+            roster_data.bump_epoch(con, "roster")
+        return ids
+    finally:
+        con.close()
+
+
+# ─────────────────────────── maintenance ──────────────────────────────────
+def maintain(*, db_file=DB_FILE, archive_file=None, pages=VACUUM_PAGES):
+    """Release free pages (if the DB uses incremental auto-vacuum) and refresh statistics."""
+    con = connect(db_file, archive_file)
+    try:
+        for schema in ("main", "archive"):
+            if con.execute(f"PRAGMA {schema}.auto_vacuum").fetchone()[0] == 2:
+                con.execute(f"PRAGMA {schema}.incremental_vacuum({int(pages)})").fetchall()
+        con.execute("ANALYZE")
+        con.execute("PRAGMA optimize")
+        with con:
+            con.execute("INSERT OR REPLACE INTO maintenance(task,last_run) VALUES('archive',?)",
+                        (datetime.datetime.now().isoformat(timespec="seconds"),))
+    finally:
+        con.close()
+
+
+def full_vacuum(*, db_file=DB_FILE, archive_file=None):
+    """One-off: switch both files to incremental auto-vacuum (rewrites the files)."""
+    for path in (db_file, archive_file or archive_path(db_file)):
+        if not os.path.exists(path):            # no archive yet – nothing to convert
+            continue
+        con = sqlite3.connect(path)
+        try:
+            con.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            con.execute("VACUUM")
+        finally:
+            con.close()
+
+
+def due(*, db_file=DB_FILE, interval_days=MAINTENANCE_DAYS):
+    with sqlite3.connect(db_file) as con:
+        ensure_schema(con)
+        row = con.execute("SELECT last_run FROM maintenance WHERE task='archive'").fetchone()
+    if not row or not row[0]:
+        return True
+    last = datetime.datetime.fromisoformat(row[0])
+    return datetime.datetime.now() - last >= datetime.timedelta(days=interval_days)
+
+
+def run_scheduled(*, db_file=DB_FILE, archive_file=None, days=ARCHIVE_DAYS, force=False):
+    """Archive + maintain if the last run is older than MAINTENANCE_DAYS; returns archived ids."""
+    if not force and not due(db_file=db_file):
+        return []
+    ids = archive_old(days=days, db_file=db_file, archive_file=archive_file)
+    maintain(db_file=db_file, archive_file=archive_file)
+    return ids
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Roster history archive")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    rp = sub.add_parser("run", help="archive old rosters and run maintenance now")
+    rp.add_argument("--days", type=int, default=ARCHIVE_DAYS)
+    vp = sub.add_parser("vacuum", help="incremental vacuum + analyze")
+    vp.add_argument("--full", action="store_true", help="one-off full VACUUM to enable incremental mode")
+    sub.add_parser("status", help="show live / archived roster counts")
+    args = ap.parse_args()
+
+    if args.cmd == "run":
+        ids = run_scheduled(days=args.days, force=True)
+        print(f"[✔] {len(ids)} roster(s) archived; maintenance done.")
+    elif args.cmd == "vacuum":
+        if args.full:
+            full_vacuum()
+        maintain()
+        print("[✔] Vacuum/analyze done.")
+    else:
+        setup()
+        con = connect()
+        live, = con.execute("SELECT COUNT(*) FROM main.roster").fetchone()
+        arch, = con.execute("SELECT COUNT(*) FROM main.roster_summary").fetchone()
+        last = con.execute("SELECT last_run FROM maintenance WHERE task='archive'").fetchone()
+        con.close()
+        print(f"live rosters: {live}   archived: {arch}   last maintenance: {last[0] if last else 'never'}")
+        for path in (DB_FILE, ARCHIVE_FILE):
+            if os.path.exists(path):
+                print(f"{os.path.basename(path)}: {os.path.getsize(path) / 1024:.0f} KiB")
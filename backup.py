@@ -0,0 +1,229 @@
+# backup.py  ───────────────────────────────────────────────────────────────
+"""
+Online backups of roster.db (and roster_archive.db) with rotation and restore.
+
+Snapshots are taken with ``sqlite3.Connection.backup`` from one connection
+that has the archive attached, inside a single read transaction: both files
+are copied as of the same moment, so an ``archive.archive_old`` run cannot
+land between them and leave a roster in neither (or both) copies.  Writers
+wait for the copy (busy timeout) rather than tear it.  Each snapshot is
+checked with ``PRAGMA integrity_check`` before it is kept; only the newest
+``KEEP`` snapshots are retained.
+
+    Backups/
+        20250105_180000/roster.db
+        20250105_180000/roster_archive.db
+
+The dashboard runs ``BackupScheduler`` on a daemon thread; main.py offers
+``restore()`` when roster.db turns out to be damaged.
+
+Command line:
+    python backup.py create
+    python backup.py list
+    python backup.py restore [SNAPSHOT]        (default: newest good snapshot)
+"""
+
+import os, time, shutil, sqlite3, pathlib, datetime, threading, argparse
+
+BASE_DIR      = os.path.dirname(os.path.abspath(__file__))
+DB_FILE       = os.path.join(BASE_DIR, "roster.db")
+ARCHIVE_NAME  = "roster_archive.db"
+BACKUP_DIR    = os.path.join(BASE_DIR, "Backups")
+KEEP          = int(os.environ.get("ROSTER_BACKUP_KEEP", "10"))
+EVERY_HOURS   = float(os.environ.get("ROSTER_BACKUP_HOURS", "24"))
+
+
+def integrity_ok(path):
+    """True when ``PRAGMA integrity_check`` reports 'ok'."""
+    try:
+        # as_uri() percent-encodes '?', '#', '%' and handles Windows drive letters
+        con = sqlite3.connect(pathlib.Path(path).resolve().as_uri() + "?mode=ro", uri=True)
+        try:
+            return con.execute("PRAGMA integrity_check").fetchone()[0] == "ok"
+        finally:
+            con.close()
+    except sqlite3.Error:
+        return False
+
+
+def _copy(src_path, dst_path):
+    src = sqlite3.connect(src_path, timeout=30)
+    dst = sqlite3.connect(dst_path)
+    try:
+        src.backup(dst)
+    finally:
+        dst.close(); src.close()
+
+
+def _companions(db_file):
+    """Files that make up one snapshot: roster.db + the archive next to it."""
+    files = [db_file]
+    arch = os.path.join(os.path.dirname(os.path.abspath(db_file)), ARCHIVE_NAME)
+    if os.path.exists(arch):
+        files.append(arch)
+    return files
+
+
+def _copy_together(db_file, dst_dir):
+    """Copy roster.db and its archive into ``dst_dir`` as of one read transaction; returns the copies."""
+    files = _companions(db_file)
+    src = sqlite3.connect(db_file, timeout=30, isolation_level=None)
+    try:
+        schemas = ["main"]
+        if len(files) > 1:
+            src.execute("ATTACH DATABASE ? AS archive", (files[1],))
+            schemas.append("archive")
+        src.execute("BEGIN")
+        for schema in schemas:              # take the read lock on every file before copying any
+            src.execute(f"SELECT count(*) FROM {schema}.sqlite_master").fetchone()
+        copies = []
+        for path, schema in zip(files, schemas):
+            dst_path = os.path.join(dst_dir, os.path.basename(path))
+            dst = sqlite3.connect(dst_path)
+            try:
+                src.backup(dst, name=schema)
+            finally:
+                dst.close()
+            copies.append(dst_path)
+        src.execute("COMMIT")
+        return copies
+    finally:
+        src.close()
+
+
+def create(*, db_file=DB_FILE, backup_dir=BACKUP_DIR, keep=KEEP):
+    """Take a verified snapshot; returns its folder.  Raises RuntimeError if it fails the check."""
+    stamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+    final = os.path.join(backup_dir, stamp)
+    tmp = final + ".part"
+    shutil.rmtree(tmp, ignore_errors=True)
+    os.makedirs(tmp)
+    try:
+        for dst in _copy_together(db_file, tmp):
+            if not integrity_ok(dst):
+                raise RuntimeError(f"Backup of {os.path.basename(dst)} failed integrity_check")
+        if os.path.exists(final):             # two backups within the same second
+            shutil.rmtree(final)
+        os.replace(tmp, final)
+    except BaseException:
+        shutil.rmtree(tmp, ignore_errors=True)
+        raise
+    rotate(backup_dir=backup_dir, keep=keep)
+    return final
+
+
+def snapshots(*, backup_dir=BACKUP_DIR):
+    """Snapshot folders, newest first."""
+    if not os.path.isdir(backup_dir):
+        return []
+    names = [n for n in os.listdir(backup_dir)
+             if not n.endswith(".part") and os.path.isdir(os.path.join(backup_dir, n))]
+    return [os.path.join(backup_dir, n) for n in sorted(names, reverse=True)]
+
+
+def rotate(*, backup_dir=BACKUP_DIR, keep=KEEP):
+    for old in snapshots(backup_dir=backup_dir)[keep:]:
+        shutil.rmtree(old, ignore_errors=True)
+
+
+def latest_good(*, backup_dir=BACKUP_DIR, db_name=os.path.basename(DB_FILE)):
+    """Newest snapshot whose roster.db passes integrity_check, or None."""
+    for snap in snapshots(backup_dir=backup_dir):
+        if integrity_ok(os.path.join(snap, db_name)):
+            return snap
+    return None
+
+
+def restore(snapshot, *, db_file=DB_FILE):
+    """Replace roster.db (and the archive) with ``snapshot``.
+
+    Every file in the snapshot is checked first, so a bad archive copy cannot
+    leave a restored roster.db paired with the current archive.  The current
+    files are kept next to the originals as ``*.broken-<time>`` – including
+    an archive the snapshot does not have, which would not match it.
+    """
+    stamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+    target_dir = os.path.dirname(os.path.abspath(db_file))
+    targets = {os.path.basename(db_file): db_file, ARCHIVE_NAME: os.path.join(target_dir, ARCHIVE_NAME)}
+    names = sorted(os.listdir(snapshot))
+    unknown = [n for n in names if n not in targets]
+    if unknown:
+        raise RuntimeError(f"Unexpected file(s) in {snapshot}: {', '.join(unknown)} – not restoring")
+    if os.path.basename(db_file) not in names:
+        raise RuntimeError(f"{snapshot} has no {os.path.basename(db_file)} – not restoring")
+    for name in names:
+        if not integrity_ok(os.path.join(snapshot, name)):
+            raise RuntimeError(f"{os.path.join(snapshot, name)} failed integrity_check – not restoring")
+
+    for name, dst in targets.items():
+        for suffix in ("", "-journal", "-wal", "-shm"):
+            if os.path.exists(dst + suffix):
+                os.replace(dst + suffix, f"{dst}{suffix}.broken-{stamp}")
+        if name in names:
+            _copy(os.path.join(snapshot, name), dst)
+    return db_file
+
+
+def last_backup_time(*, backup_dir=BACKUP_DIR):
+    snaps = snapshots(backup_dir=backup_dir)
+    if not snaps:
+        return None
+    try:
+        return datetime.datetime.strptime(os.path.basename(snaps[0]), "%Y%m%d_%H%M%S")
+    except ValueError:
+        return None
+
+
+class BackupScheduler(threading.Thread):
+    """Daemon thread: snapshot whenever the newest one is older than ``every_hours``."""
+
+    def __init__(self, *, db_file=DB_FILE, backup_dir=BACKUP_DIR, every_hours=EVERY_HOURS,
+                 check_every=600):
+        super().__init__(name="roster-backup", daemon=True)
+        self.db_file, self.backup_dir = db_file, backup_dir
+        self.every = datetime.timedelta(hours=every_hours)
+        self.check_every = check_every
+        self.stop_event = threading.Event()
+
+    def due(self):
+        last = last_backup_time(backup_dir=self.backup_dir)
+        return last is None or datetime.datetime.now() - last >= self.every
+
+    def run(self):
+        while not self.stop_event.is_set():
+            if self.due():
+                try:
+                    create(db_file=self.db_file, backup_dir=self.backup_dir)
+                except Exception as e:
+                    print(f"Backup failed: {e}")
+            self.stop_event.wait(self.check_every)
+
+    def stop(self):
+        self.stop_event.set()
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="roster.db backups")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    sub.add_parser("create", help="take a verified snapshot now")
+    sub.add_parser("list", help="list snapshots (newest first) and their integrity")
+    rp = sub.add_parser("restore", help="restore a snapshot over roster.db")
+    rp.add_argument("snapshot", nargs="?", help="snapshot folder (default: newest good one)")
+    args = ap.parse_args()
+
+    if args.cmd == "create":
+        t0 = time.perf_counter()
+        print(f"[✔] Snapshot {create()} ({time.perf_counter() - t0:.2f}s)")
+    elif args.cmd == "list":
+        for snap in snapshots():
+            ok = integrity_ok(os.path.join(snap, os.path.basename(DB_FILE)))
+            print(f"{os.path.basename(snap)}  {'ok' if ok else 'DAMAGED'}  "
+                  f"{', '.join(sorted(os.listdir(snap)))}")
+    else:
+        snap = args.snapshot or latest_good()
+        if not snap:
+            raise SystemExit("No usable snapshot found.")
+        if not os.path.isabs(snap) and not os.path.isdir(snap):
+            snap = os.path.join(BACKUP_DIR, snap)
+        restore(snap)
+        print(f"[✔] Restored {snap}")
@@ -0,0 +1,69 @@
+# bench_pdf.py  ────────────────────────────────────────────────────────────
+"""
+Per-document cost of roster PDFs: a fresh setup per document (what every
+``generate_roster_pdf`` call used to pay) versus one shared
+``pdf_generator.RosterRenderer``.
+
+Uses a synthetic week (``--staff`` columns, 7 days) – no database needed.
+
+Command line:
+    python bench_pdf.py [--docs 200] [--staff 12] [--files]
+        --files   write PDFs to a temp folder instead of in-memory buffers
+"""
+
+import os, io, time, tempfile, argparse
+import pdf_generator
+
+
+def sample_table(staff=12):
+    names = [f"Staff {i:02d}" for i in range(staff)]
+    table = [["Day/Name"] + names + ["Note"]]
+    for d, wd in enumerate(["Sunday", "Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday"]):
+        row = [f"{wd}, 2025-01-{5 + d:02d}"]
+        for i in range(staff):
+            row.append("06:00-14:30\n(8.5 h)" if (i + d) % 3 else "")
+        table.append(row + ["Fuel delivery 9am" if d == 2 else ""])
+    table.append(["Weekly Total"] + ["42.5 h"] * staff + [""])
+    return table
+
+
+def _target(folder, i):
+    return os.path.join(folder, f"bench_{i}.pdf") if folder else io.BytesIO()
+
+
+def run(docs, staff, folder=None):
+    table = sample_table(staff)
+    title = "Roster for BP Eltham from 2025-01-05 to 2025-01-11"
+
+    t0 = time.perf_counter()
+    for _ in range(docs):
+        pdf_generator.RosterRenderer()
+    setup = (time.perf_counter() - t0) / docs
+
+    t0 = time.perf_counter()
+    for i in range(docs):                        # old behaviour: set everything up per document
+        pdf_generator.RosterRenderer().render(table, _target(folder, i), title=title)
+    fresh = (time.perf_counter() - t0) / docs
+
+    shared_r = pdf_generator.RosterRenderer()
+    t0 = time.perf_counter()
+    shared_r.render_many((table, _target(folder, i), title) for i in range(docs))
+    shared = (time.perf_counter() - t0) / docs
+    return setup, fresh, shared
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Benchmark roster PDF rendering")
+    ap.add_argument("--docs", type=int, default=200)
+    ap.add_argument("--staff", type=int, default=12)
+    ap.add_argument("--files", action="store_true", help="render to files instead of memory")
+    args = ap.parse_args()
+
+    pdf_generator.RosterRenderer().render_bytes(sample_table(args.staff))   # warm imports
+    with tempfile.TemporaryDirectory() as tmp:
+        setup, fresh, shared = run(args.docs, args.staff, tmp if args.files else None)
+    print(f"{args.docs} rosters, {args.staff} staff, {'files' if args.files else 'in memory'}")
+    print(f"  setup only            {setup * 1000:7.2f} ms/doc")
+    print(f"  fresh setup per doc   {fresh * 1000:7.2f} ms/doc")
+    print(f"  shared renderer       {shared * 1000:7.2f} ms/doc   "
+          f"({(fresh - shared) * 1000:.2f} ms/doc saved, {args.docs * (fresh - shared):.2f} s per batch)")
@@ -0,0 +1,350 @@
+# compliance.py  ───────────────────────────────────────────────────────────
+"""
+Working-time rules checked against a roster.
+
+Rules are small classes that see one employee's shifts in start order:
+
+    reset(employee, max_hours)    new employee
+    feed(shift)   → [Violation]   next shift
+    finish()      → [Violation]   employee done
+
+``check()`` runs every rule over a duty stream sorted by (employee, start) –
+one pass, whatever the number of rules.  ``WeekChecker`` keeps each
+(employee, date)'s shifts and each employee's result from the last run, so an
+edit rebuilds only the (employee, date) it touched and re-checks only that
+employee.
+
+Built-in rules (limits from the environment, defaults in brackets):
+
+    max-weekly-hours   staff.max_hours per 7-day roster week
+    min-rest           ROSTER_MIN_REST_HOURS between working days   [10]
+    consecutive-days   ROSTER_MAX_CONSECUTIVE_DAYS                  [6]
+    max-shift-length   ROSTER_MAX_SHIFT_HOURS                       [12]
+    required-breaks    back-to-back shifts longer than ROSTER_BREAK_AFTER_HOURS [5]
+                       need a gap of ROSTER_MIN_BREAK_MINUTES [30]; a single
+                       shift is assumed to include its own break (06:00-14:30)
+
+Add a rule by subclassing ``Rule`` and decorating it with ``@register``.
+Every rule is built as ``cls(week_start)`` (the roster's first day, or None).
+
+Command line:
+    python compliance.py check --roster ID
+"""
+
+import os, datetime, argparse
+from itertools import groupby
+from collections import namedtuple
+import archive
+import roster_data
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DB_FILE  = os.path.join(BASE_DIR, "roster.db")
+
+MIN_REST_HOURS       = float(os.environ.get("ROSTER_MIN_REST_HOURS", "10"))
+MAX_CONSECUTIVE_DAYS = int(os.environ.get("ROSTER_MAX_CONSECUTIVE_DAYS", "6"))
+MAX_SHIFT_HOURS      = float(os.environ.get("ROSTER_MAX_SHIFT_HOURS", "12"))
+BREAK_AFTER_HOURS    = float(os.environ.get("ROSTER_BREAK_AFTER_HOURS", "5"))
+MIN_BREAK_MINUTES    = int(os.environ.get("ROSTER_MIN_BREAK_MINUTES", "30"))
+
+# start/end are absolute minutes (day ordinal * 1440 + minute) so overnight shifts compare simply
+Shift     = namedtuple("Shift", "employee date start end label")
+Violation = namedtuple("Violation", "rule employee date message")
+
+
+def make_shift(employee, ds, start, end):
+    """Shift from a duty as stored: date 'YYYY-MM-DD', times 'HH:MM' (end may pass midnight)."""
+    base = datetime.date.fromisoformat(ds).toordinal() * 1440
+    s = base + roster_data.minutes(start)
+    return Shift(employee, ds, s, s + round(roster_data.duration_hours(start, end) * 60),
+                 f"{start}-{end}")
+
+
+def week_shifts(roster_duties):
+    """{employee: [Shift, …] in start order} from the dashboard's ``{date: [duty dict]}``."""
+    out = {}
+    for ds, lst in roster_duties.items():
+        for d in lst:
+            out.setdefault(d["employee"], []).append(make_shift(d["employee"], ds, d["start"], d["end"]))
+    for lst in out.values():
+        lst.sort(key=lambda s: (s.start, s.end))
+    return out
+
+
+# ─────────────────────────── rules ────────────────────────────────────────
+RULES = []
+
+
+def register(cls):
+    RULES.append(cls)
+    return cls
+
+
+class Rule:
+    name = "rule"
+
+    def __init__(self, week_start=None):
+        self.week_start = week_start
+
+    def reset(self, employee, max_hours):
+        self.employee, self.max_hours = employee, max_hours
+
+    def feed(self, shift):
+        return []
+
+    def finish(self):
+        return []
+
+    def violation(self, ds, message):
+        return Violation(self.name, self.employee, ds, message)
+
+
+@register
+class MaxWeeklyHours(Rule):
+    name = "max-weekly-hours"
+
+    def __init__(self, week_start=None):
+        super().__init__(week_start)
+        self.anchor = week_start.toordinal() if week_start else datetime.date.min.toordinal()
+
+    def reset(self, employee, max_hours):
+        super().reset(employee, max_hours)
+        self.weeks = {}                     # week index → [minutes, first date]
+
+    def feed(self, shift):
+        if self.max_hours:
+            wk = (shift.start // 1440 - self.anchor) // 7
+            self.weeks.setdefault(wk, [0, shift.date])[0] += shift.end - shift.start
+        return []
+
+    def finish(self):
+        return [self.violation(first, f"{mins / 60:.1f} h in the week exceeds max {self.max_hours:g} h")
+                for mins, first in self.weeks.values() if mins / 60 > self.max_hours]
+
+
+@register
+class MinRest(Rule):
+    name = "min-rest"
+
+    def __init__(self, week_start=None, *, hours=MIN_REST_HOURS):
+        super().__init__(week_start)
+        self.limit = hours * 60
+
+    def reset(self, employee, max_hours):
+        super().reset(employee, max_hours)
+        self.prev = None
+
+    def feed(self, shift):
+        prev, self.prev = self.prev, (shift if not self.prev or shift.end > self.prev.end else self.prev)
+        if prev is None:
+            return []
+        gap = shift.start - prev.end
+        if gap < 0:
+            return [self.violation(shift.date, f"{shift.label} overlaps {prev.label}")]
+        if shift.date != prev.date and gap < self.limit:
+            return [self.violation(shift.date, f"only {gap / 60:.1f} h rest after {prev.date} "
+                                               f"{prev.label} (min {self.limit / 60:g} h)")]
+        return []
+
+
+@register
+class MaxConsecutiveDays(Rule):
+    name = "consecutive-days"
+
+    def __init__(self, week_start=None, *, days=MAX_CONSECUTIVE_DAYS):
+        super().__init__(week_start)
+        self.limit = days
+
+    def reset(self, employee, max_hours):
+        super().reset(employee, max_hours)
+        self.last, self.run = None, 0
+
+    def feed(self, shift):
+        day = shift.start // 1440
+        if day == self.last:
+            return []
+        self.run = self.run + 1 if self.last is not None and day == self.last + 1 else 1
+        self.last = day
+        if self.run == self.limit + 1:      # report once per run
+            return [self.violation(shift.date, f"{self.run} days in a row (max {self.limit})")]
+        return []
+
+
+@register
+class MaxShiftLength(Rule):
+    name = "max-shift-length"
+
+    def __init__(self, week_start=None, *, hours=MAX_SHIFT_HOURS):
+        super().__init__(week_start)
+        self.limit = hours * 60
+
+    def feed(self, shift):
+        if shift.end - shift.start > self.limit:
+            return [self.violation(shift.date, f"{shift.label} is {(shift.end - shift.start) / 60:.1f} h "
+                                               f"(max {self.limit / 60:g} h)")]
+        return []
+
+
+@register
+class RequiredBreaks(Rule):
+    name = "required-breaks"
+
+    def __init__(self, week_start=None, *, after_hours=BREAK_AFTER_HOURS, break_minutes=MIN_BREAK_MINUTES):
+        super().__init__(week_start)
+        self.after, self.gap = after_hours * 60, break_minutes
+
+    def reset(self, employee, max_hours):
+        super().reset(employee, max_hours)
+        self.block = None                   # [start, end, date, shift count]
+
+    def _close(self):
+        b = self.block
+        if b and b[3] > 1 and b[1] - b[0] > self.after:
+            return [self.violation(b[2], f"{(b[1] - b[0]) / 60:.1f} h back-to-back without a "
+                                         f"{self.gap}-minute break")]
+        return []
+
+    def feed(self, shift):
+        if self.block and shift.start - self.block[1] < self.gap:
+            self.block[1] = max(self.block[1], shift.end); self.block[3] += 1
+            return []
+        out = self._close()
+        self.block = [shift.start, shift.end, shift.date, 1]
+        return out
+
+    def finish(self):
+        return self._close()
+
+
+def default_rules(week_start=None):
+    """Fresh instances of every registered rule."""
+    return [cls(week_start) for cls in RULES]
+
+
+# ─────────────────────────── engine ───────────────────────────────────────
+def check_employee(employee, shifts, *, max_hours=None, rules=None):
+    """Violations for one employee's shifts (start order)."""
+    rules = rules if rules is not None else default_rules()
+    out = []
+    for r in rules:
+        r.reset(employee, max_hours)
+    for s in shifts:
+        for r in rules:
+            out.extend(r.feed(s))
+    for r in rules:
+        out.extend(r.finish())
+    return out
+
+
+def check(shifts, *, max_hours=None, rules=None):
+    """Violations for a stream sorted by (employee, start) – one pass over the stream."""
+    rules = rules if rules is not None else default_rules()
+    max_hours = max_hours or {}
+    out = []
+    for employee, own in groupby(shifts, key=lambda s: s.employee):
+        out.extend(check_employee(employee, own, max_hours=max_hours.get(employee), rules=rules))
+    return out
+
+
+def staff_limits(con):
+    """{name: max weekly hours} for staff with a usable limit."""
+    out = {}
+    for name, mx in con.execute("SELECT name,max_hours FROM staff"):
+        try:
+            if mx: out[name] = float(mx)
+        except (TypeError, ValueError):
+            pass
+    return out
+
+
+def check_roster(roster_id, *, db_file=DB_FILE):
+    """Violations of a saved roster, streamed from the database in employee order."""
+    with archive.connect(db_file) as con:
+        sd, _ = roster_data.roster_bounds(con, roster_id)
+        stream = (make_shift(d.employee, d.duty_date, d.start, d.end)
+                  for d in roster_data.iter_duties(con, roster_id, order="employee"))
+        return check(stream, max_hours=staff_limits(con),
+                     rules=default_rules(datetime.date.fromisoformat(sd)))
+
+
+class WeekChecker:
+    """Per-employee results for the week being edited; re-checks only what changed."""
+
+    def __init__(self):
+        self.days, self.shifts, self.results, self.limits, self.week_start = {}, {}, {}, {}, None
+        # days: {date: {employee: ((start, end), …)}} – what ``shifts`` was built from
+
+    def update(self, roster_duties, max_hours, week_start):
+        """Sync with the whole week (new week, undo, staff limits); returns the employees re-checked.
+
+        Days are compared by their (start, end) pairs; only (employee, date)
+        entries that differ are rebuilt.
+        """
+        if week_start != self.week_start:
+            self.days, self.shifts, self.results, self.week_start = {}, {}, {}, week_start
+        changed = set()
+        for ds in roster_duties.keys() | self.days.keys():
+            changed |= self._sync_day(ds, roster_duties.get(ds, []))
+        changed |= {e for e in max_hours.keys() | self.limits.keys() if max_hours.get(e) != self.limits.get(e)}
+        self.limits = dict(max_hours)
+        self._recheck(changed)
+        return changed
+
+    def update_day(self, ds, duties):
+        """One date was edited (``duties``: its duty dicts); returns the employees re-checked."""
+        changed = self._sync_day(ds, duties)
+        self._recheck(changed)
+        return changed
+
+    def _sync_day(self, ds, duties):
+        new = {}
+        for d in duties:
+            new.setdefault(d["employee"], []).append((d["start"], d["end"]))
+        new = {e: tuple(sorted(v)) for e, v in new.items()}
+        old = self.days.get(ds, {})
+        changed = {e for e in old.keys() | new.keys() if old.get(e) != new.get(e)}
+        for e in changed:                   # splice this date into the employee's week
+            lst = [s for s in self.shifts.get(e, []) if s.date != ds]
+            lst += [make_shift(e, ds, st, et) for st, et in new.get(e, ())]
+            lst.sort(key=lambda s: (s.start, s.end))
+            if lst: self.shifts[e] = lst
+            else: self.shifts.pop(e, None)
+        if new: self.days[ds] = new
+        else: self.days.pop(ds, None)
+        return changed
+
+    def _recheck(self, employees):
+        rules = default_rules(self.week_start)
+        for e in employees:
+            if e in self.shifts:
+                self.results[e] = check_employee(e, self.shifts[e], max_hours=self.limits.get(e), rules=rules)
+            else:
+                self.results.pop(e, None)
+
+    def violations(self):
+        return sorted((v for lst in self.results.values() for v in lst),
+                      key=lambda v: (v.date, v.employee.lower(), v.rule))
+
+    def preview(self, employee, add=None, remove=None):
+        """New violations for ``employee`` if ``add`` (ds, start, end) / ``remove`` (ds, start, end) applied."""
+        shifts = list(self.shifts.get(employee, []))
+        if remove:
+            old = make_shift(employee, *remove)
+            if old in shifts: shifts.remove(old)
+        if add:
+            shifts.append(make_shift(employee, *add)); shifts.sort(key=lambda s: (s.start, s.end))
+        before = set(self.results.get(employee, []))
+        return [v for v in check_employee(employee, shifts, max_hours=self.limits.get(employee),
+                                          rules=default_rules(self.week_start))
+                if v not in before]
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Check a roster against the working-time rules")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    cp = sub.add_parser("check"); cp.add_argument("--roster", type=int, required=True)
+    args = ap.parse_args()
+
+    found = check_roster(args.roster)
+    for v in found:
+        print(f"{v.date}  {v.employee:<20} {v.rule:<18} {v.message}")
+    print(f"[✔] roster {args.roster}: no issues" if not found else f"{len(found)} issue(s)")
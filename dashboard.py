@@ -9,8 +9,21 @@ Dashboard – Roster Management System
 
 import subprocess
 import os, sqlite3, datetime, tkinter as tk
-from   tkinter import ttk, messagebox
-import pdf_generator       
+from   tkinter import ttk, messagebox, simpledialog
+import drafts
+import pdf_store
+import exporters
+import mailer
+import employee_pdfs
+import archive
+import roster_data
+import templates
+import roster_diff
+import compliance
+import forecast
+import db_worker
+import backup
+import threading
 import platform
 import webbrowser          
 
@@ -48,6 +61,10 @@ global_duties = {d: [] for d in DAYNAMES}
 roster_duties = {}
 # per‑date note
 special_notes = {}
+# undo/redo + crash-safe autosave of the two dicts above (drafts.DraftJournal)
+draft_journal = None
+# every SQLite call from a Tk callback goes through this thread (db_worker.DBWorker)
+db = None
 
 # ─────────────────────── host open wrapper ────────────────────────────────
 def open_host(target: str):
@@ -81,13 +98,45 @@ def open_host(target: str):
 
 # ═════════════════════ launcher ═══════════════════════════════════════════
 def launch_dashboard(manager_username:str):
-    global current_manager
+    global current_manager, draft_journal, db
     current_manager = manager_username
 
+    # bring older roster.db files up to date with the newer tables/columns
+    # (before the window exists, so nothing can freeze yet)
+    archive.setup(db_file=DB)                # also pdf_store's roster.pdf_hash column
+
+    # move old rosters to roster_archive.db + vacuum/analyze (at most weekly)
+    def housekeeping():
+        try:
+            archive.run_scheduled(db_file=DB)
+        except sqlite3.Error as e:
+            print(f"Archive maintenance skipped: {e}")
+    threading.Thread(target=housekeeping,daemon=True).start()
+
+    # online snapshot into Backups/ whenever the newest one is a day old
+    backups = backup.BackupScheduler(db_file=DB); backups.start()
+
+    # restore any unfinished week before the tabs draw it
+    draft_journal = drafts.DraftJournal(global_duties, special_notes,
+                                        owner=manager_username, db_file=DB)
+    draft_journal.load()
+
     root = tk.Tk()
     root.title("Roster Dashboard – BP Eltham")
     root.geometry("1050x720")
 
+    status = ttk.Label(root,text="",anchor="w"); status.pack(side="bottom",fill="x",padx=10)
+    def busy(on):
+        status.configure(text="Working…" if on else "")
+        root.configure(cursor="watch" if on else "")
+    def db_error(e):
+        if db_worker.is_locked(e):
+            messagebox.showwarning("Database busy",
+                                   "roster.db is in use by another program.\nPlease try again in a moment.")
+        else:
+            messagebox.showerror("Database error",str(e))
+    db = db_worker.DBWorker(DB,on_busy=busy,on_error=db_error); db.start(root)
+
     nb = ttk.Notebook(root); nb.pack(fill="both",expand=True,padx=8,pady=8)
     emp  = ttk.Frame(nb); nb.add(emp ,text="Employee Management")
     rost = ttk.Frame(nb); nb.add(rost,text="Roster Creation")
@@ -103,6 +152,12 @@ def launch_dashboard(manager_username:str):
     init_about_tab   (about)
     init_help_tab    (help_)
 
+    def on_close():
+        draft_journal.close()           # final flush of the autosave journal
+        backups.stop(); db.stop()
+        root.destroy()
+    root.protocol("WM_DELETE_WINDOW", on_close)
+
     root.mainloop()
 
 # ═════════════════════ EMPLOYEES ══════════════════════════════════════════
@@ -135,10 +190,11 @@ def init_employee_tab(tab:tk.Frame, roster_tab_ref:tk.Frame):
     lb = tk.Listbox(lbfr); lb.pack(fill="both",expand=True)
 
     def refresh_list():
-        lb.delete(0,tk.END)
-        with sqlite3.connect(DB) as con:
-            for sid,n in con.execute("SELECT staff_id,name FROM staff ORDER BY name"):
-                lb.insert(tk.END, f"{sid}:{n}")
+        def show(rows):
+            lb.delete(0,tk.END)
+            for sid,n in rows: lb.insert(tk.END, f"{sid}:{n}")
+        db.submit(lambda con: con.execute("SELECT staff_id,name FROM staff ORDER BY name").fetchall(),
+                  on_done=show)
     refresh_list()
 
     def fill(_=None):
@@ -146,16 +202,18 @@ def init_employee_tab(tab:tk.Frame, roster_tab_ref:tk.Frame):
         sel=lb.curselection()
         if not sel: return
         sid=int(lb.get(sel[0]).split(":")[0]); selected_employee_id=sid
-        with sqlite3.connect(DB) as con:
-            n,e,p,m,du = con.execute(
-                "SELECT name,email,phone_number,max_hours,days_unavailable FROM staff WHERE staff_id=?",
-                (sid,)).fetchone()
-        for w,v in zip((nam,mail,pho,mx),(n,e,p,m or "")):
-            w.delete(0,tk.END); w.insert(0,v)
-        for v in day_vars.values(): v.set(0)
-        if du:
-            for d in du.split(","):
-                if d.strip() in day_vars: day_vars[d.strip()].set(1)
+        def show(row):
+            if not row: return
+            n,e,p,m,du = row
+            for w,v in zip((nam,mail,pho,mx),(n,e,p,m or "")):
+                w.delete(0,tk.END); w.insert(0,v)
+            for v in day_vars.values(): v.set(0)
+            if du:
+                for d in du.split(","):
+                    if d.strip() in day_vars: day_vars[d.strip()].set(1)
+        db.submit(lambda con: con.execute(
+                      "SELECT name,email,phone_number,max_hours,days_unavailable FROM staff WHERE staff_id=?",
+                      (sid,)).fetchone(), on_done=show)
     lb.bind("<<ListboxSelect>>", fill)
 
     def clear():
@@ -172,19 +230,23 @@ def init_employee_tab(tab:tk.Frame, roster_tab_ref:tk.Frame):
             mh= mx.get().strip() or None,
             du=",".join([d for d,v in day_vars.items() if v.get()==1])
         )
-        with sqlite3.connect(DB) as con:
+        def write(con,sid):
             cur=con.cursor()
-            if selected_employee_id:
+            if sid:
                 cur.execute("""UPDATE staff SET name=?,email=?,phone_number=?,max_hours=?,days_unavailable=?
                                WHERE staff_id=?""",
-                            (data['n'],data['e'],data['p'],data['mh'],data['du'],selected_employee_id))
+                            (data['n'],data['e'],data['p'],data['mh'],data['du'],sid))
             else:
                 cur.execute("""INSERT INTO staff(name,email,phone_number,max_hours,days_unavailable)
                                VALUES(?,?,?,?,?)""",
                             (data['n'],data['e'],data['p'],data['mh'],data['du']))
-        selected_employee_id=None; clear(); refresh_list()
-        messagebox.showinfo("Saved","Employee record saved.",parent=tab)
-        if roster_tab_ref._refresh_week: roster_tab_ref._refresh_week()
+            roster_data.bump_epoch(con,"staff")     # api_server.py drops cached staff
+        def saved(_):
+            global selected_employee_id
+            selected_employee_id=None; clear(); refresh_list()
+            messagebox.showinfo("Saved","Employee record saved.",parent=tab)
+            if roster_tab_ref._refresh_week: roster_tab_ref._refresh_week()
+        db.submit(write,selected_employee_id,on_done=saved)
 
     ttk.Button(frm,text="Add / Update",command=save).grid(row=row+1,column=0,columnspan=2,pady=6)
 
@@ -194,20 +256,24 @@ def init_employee_tab(tab:tk.Frame, roster_tab_ref:tk.Frame):
         if not sel: return
         sid_s,nm = lb.get(sel[0]).split(":",1)
         if not messagebox.askyesno("Confirm",f"Delete {nm}?",parent=tab): return
-        with sqlite3.connect(DB) as con:
+        def write(con):
             con.execute("DELETE FROM staff WHERE staff_id=?",(int(sid_s),))
-        for lst in global_duties.values():
-            lst[:] = [d for d in lst if d['employee']!=nm]
-        clear(); refresh_list()
-        if roster_tab_ref._refresh_week: roster_tab_ref._refresh_week()
+            roster_data.bump_epoch(con,"staff")
+        def deleted(_):
+            if any(d['employee']==nm for lst in global_duties.values() for d in lst):
+                draft_journal.replace({wd:[d for d in lst if d['employee']!=nm]
+                                       for wd,lst in global_duties.items()})
+            clear(); refresh_list()
+            if roster_tab_ref._refresh_week: roster_tab_ref._refresh_week()
+        db.submit(write,on_done=deleted)
     ttk.Button(frm,text="Delete",command=delete).grid(row=row+2,column=0,columnspan=2,pady=(2,8))
 
     # copy emails
     def copy_emails():
-        with sqlite3.connect(DB) as con:
-            emails=",".join(e for e, in con.execute("SELECT email FROM staff"))
-        tab.clipboard_clear(); tab.clipboard_append(emails)
-        messagebox.showinfo("Copied",f"{len(emails.split(','))} addresses copied.",parent=tab)
+        def copy(emails):
+            tab.clipboard_clear(); tab.clipboard_append(emails)
+            messagebox.showinfo("Copied",f"{len(emails.split(','))} addresses copied.",parent=tab)
+        db.submit(lambda con: ",".join(e for e, in con.execute("SELECT email FROM staff")),on_done=copy)
     ttk.Button(tab,text="Copy ALL emails",command=copy_emails
               ).grid(row=2,column=0,pady=(0,10))
 
@@ -229,13 +295,28 @@ def init_roster_tab(tab:tk.Frame):
 
     finalize_btn = ttk.Button(top,text="Finalize Roster"); finalize_btn.grid(row=0,column=6,padx=(16,2))
     start_new_btn= ttk.Button(top,text="Start New");      start_new_btn.grid(row=0,column=7)
+    undo_btn     = ttk.Button(top,text="Undo",width=6);   undo_btn.grid(row=0,column=8,padx=(16,2))
+    redo_btn     = ttk.Button(top,text="Redo",width=6);   redo_btn.grid(row=0,column=9)
+    export_btn   = ttk.Button(top,text="Export…");        export_btn.grid(row=0,column=10,padx=(16,2))
+
+    tpl_bar = ttk.Frame(top); tpl_bar.grid(row=1,column=0,columnspan=11,sticky="w",pady=(6,0))
+    ttk.Label(tpl_bar,text="Template").pack(side="left")
+    tpl_v  = tk.StringVar()
+    tpl_cb = ttk.Combobox(tpl_bar,textvariable=tpl_v,width=30); tpl_cb.pack(side="left",padx=5)
+    tpl_apply_btn = ttk.Button(tpl_bar,text="Apply");      tpl_apply_btn.pack(side="left",padx=2)
+    tpl_save_btn  = ttk.Button(tpl_bar,text="Save as…");   tpl_save_btn.pack(side="left",padx=2)
+    tpl_diff_btn  = ttk.Button(tpl_bar,text="Compare…");   tpl_diff_btn.pack(side="left",padx=2)
+    chg_btn = ttk.Button(tpl_bar,text="Changes…");         chg_btn.pack(side="left",padx=(24,2))
+    chg_lbl = ttk.Label(tpl_bar,text="");                  chg_lbl.pack(side="left",padx=4)
 
     # ───────────── history dropdown --------------------------------------
     def refresh_hist():
-        with sqlite3.connect(DB) as con:
-            rows = con.execute("""SELECT roster_id,start_date,end_date,created_at
-                                    FROM roster ORDER BY created_at DESC""").fetchall()
-        prev_cb["values"] = [f"{rid}: {sd} → {ed} @ {ts}" for rid,sd,ed,ts in rows]
+        def show(rows):
+            prev_cb["values"] = [f"{rid}: {sd} → {ed} @ {ts}"+(" [archived]" if arc else "")
+                                 for rid,sd,ed,ts,arc in rows]
+        db.submit(lambda con: con.execute(           # live + archived rosters
+                      """SELECT roster_id,start_date,end_date,created_at,archived
+                           FROM all_roster ORDER BY created_at DESC""").fetchall(), on_done=show)
     refresh_hist()
 
     # ───────────── main split (week grid + hours) ─────────────────────────
@@ -243,8 +324,79 @@ def init_roster_tab(tab:tk.Frame):
     week_fr = ttk.LabelFrame(main,text="Week Duties");  week_fr.pack(side="left",fill="both",expand=True)
     side_fr = ttk.LabelFrame(main,text="Weekly Hours"); side_fr.pack(side="left",fill="y",padx=(6,0))
     hours_lb= tk.Listbox(side_fr,width=28); hours_lb.pack(fill="y",expand=True,padx=5,pady=5)
-
-    day_lbs,note_entries = {},{}
+    ttk.Label(side_fr,text="Compliance").pack(anchor="w",padx=5)
+    comp_lb = tk.Listbox(side_fr,width=28,height=8,fg="#b00000"); comp_lb.pack(fill="x",padx=5,pady=(0,5))
+
+    day_lbs,note_entries,fc_lbls = {},{},{}
+
+    # ───────────── changes vs. the last finalized roster of this week -------
+    change_base = {}                     # start date → (roster_id, keyed shifts), read once per week
+    def load_base(con,sd_s):
+        rid=roster_diff.previous_revision(con,start_date=sd_s)
+        return rid,(roster_diff.from_roster(con,rid) if rid else {})
+    def week_changes():
+        """(base roster id, [Change]) – or None while the base is still being read."""
+        sd_s=start_e.get_date().strftime("%Y-%m-%d")
+        if sd_s not in change_base:
+            change_base[sd_s]=None
+            db.submit(load_base,sd_s,
+                      on_done=lambda r,k=sd_s: (change_base.__setitem__(k,r),show_change_count()))
+        if change_base[sd_s] is None: return None
+        rid,old=change_base[sd_s]
+        return rid,(roster_diff.diff(old,roster_diff.from_week(roster_duties)) if rid else [])
+    def show_change_count():
+        got=week_changes()
+        if got is None:
+            chg_lbl.configure(text="comparing…"); return
+        rid,changes=got
+        people=len(roster_diff.by_employee(changes))
+        chg_lbl.configure(text="" if not rid else
+                          f"vs roster {rid}: {len(changes)} change(s), {people} employee(s)" if changes else
+                          f"same as roster {rid}")
+
+    # ───────────── suggested coverage from past rosters (forecast.py) --------
+    forecast_cache = {}                  # start date → forecast.forecast_week(), read once per week
+    def show_forecast():
+        sd=start_e.get_date(); sd_s=sd.strftime("%Y-%m-%d")
+        if sd_s not in forecast_cache:
+            forecast_cache[sd_s]=None
+            db.submit(lambda con,d=sd: forecast.forecast_week(con,d),
+                      on_done=lambda r,k=sd_s: (forecast_cache.__setitem__(k,r),show_forecast()))
+        fc=forecast_cache[sd_s]
+        if fc is None: return
+        for ds,lbl in fc_lbls.items():
+            f=fc.get(ds)
+            if not f:
+                lbl.configure(text=""); continue
+            actual=forecast.coverage([(d['start'],d['end']) for d in roster_duties[ds]])
+            short=forecast.shortfall(f['target'],actual)
+            txt="Suggested: "+forecast.describe(f['target'])+(" (holiday)" if f['holiday'] else "")
+            if short: txt+="\nShort: "+", ".join(f"{a}-{b} ×{n}" for a,b,n in short)
+            lbl.configure(text=txt,foreground="#b00000" if short else "gray")
+
+    # ───────────── compliance (re-checks only employees whose shifts changed) --
+    checker = compliance.WeekChecker()
+    staff = {"rows":None,"limits":{}}    # staff list cached on the Tk side, reloaded on staff changes
+    def load_staff(then=None):
+        def q(con):
+            return (con.execute("SELECT name,days_unavailable FROM staff").fetchall(),
+                    compliance.staff_limits(con))
+        def done(res):
+            staff["rows"],staff["limits"]=res
+            recheck()
+            if then: then()
+        db.submit(q,on_done=done)
+    def recheck(ds=None):                 # ds: the one date an edit touched
+        if ds: checker.update_day(ds,roster_duties[ds])
+        else:  checker.update(roster_duties,staff["limits"],start_e.get_date())
+        comp_lb.delete(0,tk.END)
+        for v in checker.violations():
+            comp_lb.insert(tk.END,f"{v.date[5:]} {v.employee}: {v.message}")
+        if not comp_lb.size(): comp_lb.insert(tk.END,"(No issues)")
+    def warn_rules(emp,ds,s,e,old=None,parent=None):
+        new=checker.preview(emp,add=(ds,s,e),remove=old)
+        if new:
+            messagebox.showwarning("Compliance","\n".join(f"{emp}: {v.message}" for v in new),parent=parent)
 
     # ───────────── helpers ------------------------------------------------
     def recalc_hours():
@@ -266,13 +418,14 @@ def init_roster_tab(tab:tk.Frame):
             lb.insert(tk.END,"(No duties)")
 
     # ───────────── build / rebuild current week view ----------------------
-    def build_week():
+    def build_week(edited=None):          # edited: date of a single-duty edit, if that is all
         old_notes = special_notes.copy()
 
         for w in week_fr.winfo_children(): w.destroy()
-        day_lbs.clear(); note_entries.clear(); roster_duties.clear()
+        day_lbs.clear(); note_entries.clear(); fc_lbls.clear(); roster_duties.clear()
 
         sd = start_e.get_date()
+        draft_journal.set_start(sd.strftime("%Y-%m-%d"))
         end_e.configure(state="normal")
         end_e.set_date(sd+datetime.timedelta(days=6))
         end_e.configure(state="disabled")
@@ -292,6 +445,8 @@ def init_roster_tab(tab:tk.Frame):
             lb=tk.Listbox(cell,width=40,height=4); lb.pack()
             day_lbs[ds]=lb; lb.bind("<Double-Button-1>",lambda _,d=ds: edit_duty(d))
             refresh_day(ds)
+            fc_lbls[ds]=ttk.Label(cell,text="",foreground="gray",wraplength=300,justify="left")
+            fc_lbls[ds].pack(anchor="w")
 
             bf=ttk.Frame(cell); bf.pack(pady=2)
             ttk.Button(bf,text="Add",   command=lambda d=ds: add_duty(d)).pack(side="left",padx=2)
@@ -300,40 +455,32 @@ def init_roster_tab(tab:tk.Frame):
             ttk.Label(cell,text="Note:").pack(anchor="w")
             en=tk.Entry(cell,width=40); en.pack(fill="x")
             en.insert(0,special_notes[ds])
-            en.bind("<FocusOut>",lambda ev,d=ds,e=en: special_notes.__setitem__(d,e.get()))
+            en.bind("<FocusOut>",lambda ev,d=ds,e=en: draft_journal.note(d,e.get()))
             note_entries[ds]=en
 
-        recalc_hours()
-    tab._refresh_week = build_week   # allow employee tab to trigger live refresh
+        recalc_hours(); recheck(edited); show_change_count(); show_forecast()
+        undo_btn.configure(state="normal" if draft_journal.can_undo() else "disabled")
+        redo_btn.configure(state="normal" if draft_journal.can_redo() else "disabled")
+    tab._refresh_week = lambda: load_staff(then=build_week)   # employee tab: staff changed
 
-    # initial draw
-    start_e.set_date(datetime.date.today()); build_week()
+    # initial draw (resume the autosaved draft's week if there is one)
+    resume_date = (datetime.date.fromisoformat(draft_journal.start_date)
+                   if draft_journal.start_date else datetime.date.today())
+    start_e.set_date(resume_date); build_week(); load_staff()
     start_e.bind("<<DateEntrySelected>>", lambda _ : build_week())
 
     # ───────────── available helpers --------------------------------------
     def _duration(a,b):
         return (datetime.datetime.strptime(b,"%H:%M")-
                 datetime.datetime.strptime(a,"%H:%M")).seconds/3600
-    def _max_hours(emp):
-        with sqlite3.connect(DB) as con:
-            r=con.execute("SELECT max_hours FROM staff WHERE name=?",(emp,)).fetchone()
-        try: return float(r[0]) if r and r[0] else None
-        except: return None
-    def _total_hours(emp,delta=0):
-        tot=0.0
-        for lst in global_duties.values():
-            for d in lst:
-                if d['employee']==emp:
-                    tot+=_duration(d['start'],d['end'])
-        return tot+delta
     def available_staff(wd):
-        with sqlite3.connect(DB) as con:
-            return [n for n,du in con.execute("SELECT name,days_unavailable FROM staff")
-                    if not du or wd not in du.split(",")]
+        return [n for n,du in staff["rows"] or [] if not du or wd not in du.split(",")]
 
     # ───────────── duty CRUD ----------------------------------------------
     def add_duty(ds):
         wd=datetime.datetime.strptime(ds,"%Y-%m-%d").strftime("%A")
+        if staff["rows"] is None:
+            messagebox.showinfo("Info","Staff list is still loading – try again.",parent=tab); return
         av=available_staff(wd)
         if not av:
             messagebox.showinfo("Info",f"No staff available on {wd}.",parent=tab); return
@@ -348,12 +495,9 @@ def init_roster_tab(tab:tk.Frame):
         def sv():
             s,e=st.get(),et.get()
             if e<=s: messagebox.showerror("Err","End after Start",parent=w); return
-            dur=_duration(s,e)
-            mx=_max_hours(emp.get())
-            if mx and _total_hours(emp.get(),dur)>mx:
-                messagebox.showwarning("Max exceeded",f"{emp.get()} exceeds {mx} h",parent=w)
-            global_duties[wd].append({"employee":emp.get(),"start":s,"end":e})
-            build_week(); w.destroy()
+            warn_rules(emp.get(),ds,s,e,parent=w)
+            draft_journal.add(wd,{"employee":emp.get(),"start":s,"end":e})
+            build_week(ds); w.destroy()
         ttk.Button(w,text="Save",command=sv).grid(row=3,column=0,columnspan=2,pady=6)
 
     def edit_duty(ds):
@@ -372,26 +516,32 @@ def init_roster_tab(tab:tk.Frame):
         def sv():
             s,e=st.get(),et.get()
             if e<=s: messagebox.showerror("Err","End after Start",parent=w); return
-            delta=_duration(s,e)-_duration(duty['start'],duty['end'])
-            mx=_max_hours(emp.get())
-            if mx and _total_hours(emp.get(),delta)>mx:
-                messagebox.showwarning("Max exceeded",f"{emp.get()} exceeds {mx} h",parent=w)
-            duty.update(employee=emp.get(),start=s,end=e)
-            global_duties[wd][idx]=duty.copy(); build_week(); w.destroy()
+            warn_rules(emp.get(),ds,s,e,parent=w,
+                       old=(ds,duty['start'],duty['end']) if emp.get()==duty['employee'] else None)
+            draft_journal.edit(wd,idx,{"employee":emp.get(),"start":s,"end":e})
+            build_week(ds); w.destroy()
         ttk.Button(w,text="Save",command=sv).grid(row=3,column=0,columnspan=2,pady=6)
 
     def rm_duty(ds):
         lb=day_lbs[ds]; sel=lb.curselection()
         if sel:
             wd=datetime.datetime.strptime(ds,"%Y-%m-%d").strftime("%A")
-            global_duties[wd].pop(sel[0]); build_week()
+            draft_journal.remove(wd,sel[0]); build_week(ds)
 
     # ───────────── start new ----------------------------------------------
-    start_new_btn.configure(command=lambda: ( [v.clear() for v in global_duties.values()],
+    start_new_btn.configure(command=lambda: ( draft_journal.replace({}, {}),
                                               roster_duties.clear(),
-                                              special_notes.clear(),
                                               build_week() ))
 
+    # ───────────── undo / redo (journal driven) ----------------------------
+    def undo(_=None):
+        if draft_journal.undo(): build_week()
+    def redo(_=None):
+        if draft_journal.redo(): build_week()
+    undo_btn.configure(command=undo); redo_btn.configure(command=redo)
+    tab.winfo_toplevel().bind("<Control-z>",undo)
+    tab.winfo_toplevel().bind("<Control-y>",redo)
+
     # ───────────── load previous roster  (by weekday) ----------------------
     def load_prev(_=None):
         sel=prev_v.get()
@@ -401,110 +551,236 @@ def init_roster_tab(tab:tk.Frame):
         except ValueError:
             messagebox.showerror("Err","Bad roster id."); return
 
-        # reset template + notes
-        for v in global_duties.values(): v.clear()
-        special_notes.clear()
-
-        with sqlite3.connect(DB) as con:
-            cur=con.cursor()
-            rows=cur.execute("""SELECT duty_date,employee,start_time,end_time,note
-                                  FROM roster_duties WHERE roster_id=?""",(rid,)).fetchall()
-
-        note_by_wd={}
-        for ds,emp,st,et,note in rows:
-            wd=datetime.datetime.strptime(ds,"%Y-%m-%d").strftime("%A")
-            global_duties[wd].append({"employee":emp,"start":st,"end":et})
-            if note: note_by_wd.setdefault(wd,note)
-
-        build_week()                         # uses the new template
-
-        # copy notes onto the freshly built week
-        for i in range(7):
-            d  = start_e.get_date()+datetime.timedelta(days=i)
-            ds = d.strftime("%Y-%m-%d"); wd=d.strftime("%A")
-            txt=note_by_wd.get(wd,"")
-            special_notes[ds]=txt
-            if ds in note_entries:
-                en=note_entries[ds]
-                en.delete(0,tk.END); en.insert(0,txt)
-        recalc_hours()
+        # strftime('%w') → 0=Sunday … 6=Saturday, same order as DAYNAMES
+        query="""SELECT CAST(strftime('%w',duty_date) AS INTEGER),
+                        employee,start_time,end_time,note
+                   FROM all_roster_duties WHERE roster_id=?"""
+
+        def apply_rows(rows):
+            # new template + notes, applied as one undoable step
+            template={wd:[] for wd in DAYNAMES}; note_by_wd={}
+            for wdi,emp,st,et,note in rows:
+                wd=DAYNAMES[wdi]
+                template[wd].append({"employee":emp,"start":st,"end":et})
+                if note: note_by_wd.setdefault(wd,note)
+            notes={}
+            for i in range(7):
+                d  = start_e.get_date()+datetime.timedelta(days=i)
+                notes[d.strftime("%Y-%m-%d")]=note_by_wd.get(d.strftime("%A"),"")
+            draft_journal.replace(template,notes)
+
+            build_week()                         # uses the new template + notes
+        db.submit(lambda con: con.execute(query,(rid,)).fetchall(),on_done=apply_rows)
 
     prev_cb.bind("<<ComboboxSelected>>", load_prev)
 
+    # ───────────── export (CSV / iCalendar / XLSX) -------------------------
+    def export_dialog():
+        sel=prev_v.get()
+        rid=int(sel.split(":")[0]) if sel else None
+        w=tk.Toplevel(); w.title("Export Rosters"); w.grab_set()
+        fmt=tk.StringVar(value="csv"); scope=tk.StringVar(value="roster" if rid else "all")
+        ttk.Label(w,text="Format").grid(row=0,column=0,sticky="e",padx=4,pady=4)
+        ttk.Combobox(w,values=sorted(exporters.EXPORTERS),textvariable=fmt,
+                     state="readonly",width=8).grid(row=0,column=1,sticky="w")
+        ttk.Radiobutton(w,text=f"Selected roster ({sel.split(' @')[0]})" if rid else "Selected roster (none)",
+                        variable=scope,value="roster",state="normal" if rid else "disabled"
+                        ).grid(row=1,column=0,columnspan=2,sticky="w",padx=4)
+        ttk.Radiobutton(w,text="All history",variable=scope,value="all"
+                        ).grid(row=2,column=0,columnspan=2,sticky="w",padx=4)
+        status=ttk.Label(w,text=""); status.grid(row=4,column=0,columnspan=2,pady=(0,6))
+
+        def run():
+            result={}
+            kind,roster=fmt.get(),(rid if scope.get()=="roster" else None)   # Tk vars: read here, not in work()
+            def work():                      # streams rows – safe for the full history
+                try:
+                    result["path"]=exporters.export(kind,roster_id=roster,db_file=DB)
+                except Exception as e:
+                    result["error"]=e
+            def poll():
+                if th.is_alive(): w.after(100,poll); return
+                go.configure(state="normal")
+                if "error" in result:
+                    status.configure(text="")
+                    messagebox.showerror("Export failed",str(result["error"]),parent=w); return
+                status.configure(text=f"Saved: {os.path.relpath(result['path'],BASE_DIR)}")
+                open_host(result["path"] if kind=="ics" else os.path.dirname(result["path"]))
+            go.configure(state="disabled"); status.configure(text="Exporting…")
+            th=threading.Thread(target=work,daemon=True); th.start(); poll()
+        go=ttk.Button(w,text="Export",command=run); go.grid(row=3,column=0,columnspan=2,pady=6)
+    export_btn.configure(command=export_dialog)
+
+    # ───────────── named templates ----------------------------------------
+    # templates.py opens its own connections – run it on the DB thread all the same
+    def refresh_templates():
+        db.submit(lambda con: templates.names(db_file=DB),
+                  on_done=lambda names: tpl_cb.configure(values=names))
+    refresh_templates()
+
+    def current_template():
+        for ds,en in note_entries.items(): draft_journal.note(ds,en.get())
+        return templates.capture(global_duties,special_notes,start_e.get_date())
+
+    def apply_template():
+        name=tpl_v.get().strip()
+        def apply(body):
+            if body is None:
+                messagebox.showinfo("Template","Pick a saved template first.",parent=tab); return
+            duties,notes=templates.apply(body,start_e.get_date())
+            draft_journal.replace(duties,notes); build_week()
+        db.submit(lambda con: templates.get(name,db_file=DB),on_done=apply)
+
+    def save_template():
+        name=simpledialog.askstring("Save template","Template name:",
+                                    initialvalue=tpl_v.get(),parent=tab)
+        if not name or not name.strip(): return
+        name=name.strip(); body=current_template()
+        def write(con):
+            unchanged = templates.get(name,db_file=DB)==body
+            return unchanged,templates.save(name,body,db_file=DB)
+        def saved(res):
+            unchanged,v=res
+            refresh_templates(); tpl_v.set(name)
+            messagebox.showinfo("Template",f"'{name}' unchanged (v{v})." if unchanged
+                                           else f"Saved '{name}' as v{v}.",parent=tab)
+        db.submit(write,on_done=saved)
+
+    def compare_template():
+        name=tpl_v.get().strip()
+        def read(con):
+            body=templates.get(name,db_file=DB)
+            if body is None: return None
+            vs=templates.versions(name,db_file=DB)
+            prev=templates.get(name,vs[-2][0],db_file=DB) if len(vs)>1 else None
+            return body,vs,prev
+        def show(res):
+            if res is None:
+                messagebox.showinfo("Template","Pick a saved template first.",parent=tab); return
+            body,vs,prev=res
+            lines=[f"'{name}' v{vs[-1][0]} → current week",""]
+            lines+=templates.format_diff(templates.diff(body,current_template()))
+            if prev is not None:
+                lines+=["",f"v{vs[-2][0]} → v{vs[-1][0]}",""]
+                lines+=templates.format_diff(templates.diff(prev,body))
+            lines+=["","Versions: "+", ".join(f"v{v} ({ts})" for v,ts in vs)]
+            w=tk.Toplevel(); w.title(f"Template – {name}")
+            txt=tk.Text(w,width=70,height=24,font=("Consolas",10)); txt.pack(fill="both",expand=True)
+            txt.insert("1.0","\n".join(lines)); txt.configure(state="disabled")
+        db.submit(read,on_done=show)
+
+    tpl_apply_btn.configure(command=apply_template)
+    tpl_save_btn.configure(command=save_template)
+    tpl_diff_btn.configure(command=compare_template)
+
+    def show_changes():
+        got=week_changes()
+        if got is None: return               # base roster still loading – label says so
+        rid,changes=got
+        lines=([f"Current week vs. finalized roster {rid}",""]+roster_diff.format_changes(changes)
+               if rid else ["This week has not been finalized yet – nothing to compare."])
+        w=tk.Toplevel(); w.title("Roster changes")
+        txt=tk.Text(w,width=80,height=24,font=("Consolas",10)); txt.pack(fill="both",expand=True)
+        txt.insert("1.0","\n".join(lines)); txt.configure(state="disabled")
+    chg_btn.configure(command=show_changes)
+
     
 
 
     # finalize --------------------------------------------------------------
-    def finalize():
-        # Prevent duplicate finalize calls in rapid clicks
-        finalize_btn.configure(state="disabled")
-        tab.after(3000, lambda: finalize_btn.configure(state="normal"))  # Re-enable after 3s
-
+    def finalize_job(con,sd,sd_s,ed_s,week,notes):
+        """DB thread: duplicate check, render/reuse the PDF, then save it all in one commit."""
         # Check if this roster (same duties + notes) is already saved
-        with sqlite3.connect(DB) as con:
-            existing_rows = con.execute("""
-                SELECT duty_date, employee, start_time, end_time
-                FROM roster_duties
-                WHERE roster_id = (SELECT MAX(roster_id) FROM roster)
-            """).fetchall()
-
-            current_rows = []
-            for ds, dl in roster_duties.items():
-                for d in dl:
-                    current_rows.append((ds, d['employee'], d['start'], d['end']))
-
-            if set(existing_rows) == set(current_rows):
-                messagebox.showinfo("Duplicate Detected", "This roster already exists. Not saving again.")
-                return
-
-        for ds,en in note_entries.items(): special_notes[ds]=en.get()
-        sd=start_e.get_date(); ed=end_e.get_date()
-        sd_s,ed_s=sd.strftime("%Y-%m-%d"),ed.strftime("%Y-%m-%d")
-        with sqlite3.connect(DB) as con:
-            cur=con.cursor()
-            cur.execute("INSERT INTO roster(start_date,end_date,pdf_file) VALUES(?,?,?)",(sd_s,ed_s,""))
-            rid=cur.lastrowid
-            for ds,dl in roster_duties.items():
-                note=special_notes.get(ds,"")
-                for d in dl:
-                    cur.execute("""INSERT INTO roster_duties
-                                   (roster_id,duty_date,employee,start_time,end_time,note)
-                                   VALUES(?,?,?,?,?,?)""",(rid,ds,d['employee'],d['start'],d['end'],note))
-        refresh_hist()
-
-        # pdf ----------------------------------------------------------------
-        with sqlite3.connect(DB) as con:
-            emp_names=[e for e, in con.execute("SELECT name FROM staff")]
+        existing_rows = con.execute("""
+            SELECT duty_date, employee, start_time, end_time
+            FROM roster_duties
+            WHERE roster_id = (SELECT MAX(roster_id) FROM roster)
+        """).fetchall()
+        current_rows = [(ds,d['employee'],d['start'],d['end']) for ds,dl in week.items() for d in dl]
+        if set(existing_rows) == set(current_rows):
+            return None
+
+        emp_names=[e for e, in con.execute("SELECT name FROM staff")]
+
+        # pdf first: a failed render leaves nothing behind -------------------
         header=["Day/Name"]+emp_names+["Note"]; totals={e:0.0 for e in emp_names}; table=[header]
         for i in range(7):
             d=sd+datetime.timedelta(days=i); ds=d.strftime("%Y-%m-%d"); wd=d.strftime("%A")
             row=[f"{wd}, {ds}"]
             for emp in emp_names:
-                seg=[x for x in roster_duties[ds] if x['employee']==emp]
+                seg=[x for x in week[ds] if x['employee']==emp]
                 txt=""; hrs=0
                 for s in seg:
                     txt+=f"{s['start']}-{s['end']}\n"
                     hrs+=_duration(s['start'],s['end'])
                 if hrs: txt+=f"({hrs:.1f} h)"; totals[emp]+=hrs
                 row.append(txt)
-            row.append(special_notes.get(ds,"")); table.append(row)
+            row.append(notes.get(ds,"")); table.append(row)
         table.append(["Weekly Total"]+[f"{totals[e]:.1f} h" for e in emp_names]+[""])
 
-        now = datetime.datetime.now()
-        timestamp = now.strftime("%Y%m%d_%H%M%S")
-        pdf_path = os.path.abspath(os.path.join(
-            ROSTERSDIR, f"roster_{timestamp}.pdf"))
+        title_line=f"Roster for BP Eltham from {sd_s} to {ed_s}"
+        # identical table + title → reuse the stored PDF instead of rendering again
+        # (pdf_store writes through its own connection – nothing is pending on ours yet)
+        pdf_path,pdf_hash,reused = pdf_store.get_or_render(table,title=title_line,db_file=DB)
+
+        # roster + duties + pdf reference: one transaction ---------------------
+        cur=con.cursor()
+        cur.execute("INSERT INTO roster(start_date,end_date,pdf_file) VALUES(?,?,?)",(sd_s,ed_s,""))
+        rid=cur.lastrowid
+        for ds,dl in week.items():
+            note=notes.get(ds,"")
+            for d in dl:
+                cur.execute("""INSERT INTO roster_duties
+                               (roster_id,duty_date,employee,start_time,end_time,note)
+                               VALUES(?,?,?,?,?,?)""",(rid,ds,d['employee'],d['start'],d['end'],note))
+        pdf_store.attach(con,rid,pdf_path,pdf_hash)
+        roster_data.bump_epoch(con,"roster")    # api_server.py drops cached rosters
+        con.commit()
+        base_rid,changes=roster_diff.compare(rid,db_file=DB)
+        return sd_s,rid,pdf_path,reused,base_rid,changes
 
-        title_line=f"Roster for BP Eltham from {sd_s} to {ed_s}"
-        # try title kw, fall back if pdf_generator doesn't accept it
-        try:
-            pdf_generator.generate_roster_pdf(table,filename=pdf_path,title=title_line)
-        except TypeError:
-            pdf_generator.generate_roster_pdf(table,filename=pdf_path)
+    def finalize():
+        # working-time rules: one pass over the whole week before it is saved
+        shifts=compliance.week_shifts(roster_duties)
+        issues=compliance.check((s for emp in sorted(shifts) for s in shifts[emp]),max_hours=staff["limits"],
+                                rules=compliance.default_rules(start_e.get_date()))
+        if issues and not messagebox.askyesno(
+                "Compliance",f"{len(issues)} rule issue(s):\n\n"
+                +"\n".join(f"{v.date} {v.employee}: {v.message}" for v in issues[:15])
+                +("\n…" if len(issues)>15 else "")+"\n\nFinalize anyway?",parent=tab):
+            return
+
+        for ds,en in note_entries.items(): special_notes[ds]=en.get()
+        sd=start_e.get_date(); ed=end_e.get_date()
+        sd_s,ed_s=sd.strftime("%Y-%m-%d"),ed.strftime("%Y-%m-%d")
+        week={ds:[dict(d) for d in dl] for ds,dl in roster_duties.items()}
+
+        # Prevent duplicate finalize calls while the DB thread is saving
+        finalize_btn.configure(state="disabled")
+        def failed(e):
+            finalize_btn.configure(state="normal"); db.on_error(e)
+        db.submit(finalize_job,sd,sd_s,ed_s,week,dict(special_notes),on_done=finalized,on_error=failed)
+
+    def finalized(res):
+        finalize_btn.configure(state="normal")
+        if res is None:
+            messagebox.showinfo("Duplicate Detected", "This roster already exists. Not saving again.")
+            return
+        sd_s,rid,pdf_path,reused,base_rid,changes=res
+        refresh_hist(); change_base.pop(sd_s,None); show_change_count()
+        forecast_cache.clear()               # the new week feeds the next forecasts
+        draft_journal.reset()                # week is saved – drop the autosaved draft
+        undo_btn.configure(state="disabled"); redo_btn.configure(state="disabled")
 
         # popup -------------------------------------------------------------
         pv=tk.Toplevel(); pv.title("Roster PDF")
-        ttk.Label(pv,text=pdf_path,font=("Helvetica",9,"bold")).pack(padx=10,pady=10)
+        ttk.Label(pv,text=pdf_path,font=("Helvetica",9,"bold")).pack(padx=10,pady=(10,0))
+        if reused:
+            ttk.Label(pv,text="Unchanged roster – existing PDF reused.").pack(padx=10)
+        if base_rid:
+            ttk.Label(pv,text=f"Revision of roster {base_rid}: {len(changes)} shift change(s) for "
+                              f"{len(roster_diff.by_employee(changes))} employee(s).").pack(padx=10)
+        ttk.Frame(pv).pack(pady=5)
         bf=ttk.Frame(pv); bf.pack(pady=6)
         def open_pdf():
             if os.name == "nt":
@@ -516,10 +792,73 @@ def init_roster_tab(tab:tk.Frame):
                     messagebox.showerror("Execution Error", f"Failed to run host opener for PDF. Error: {e}", parent=pv)
 
         def copy_mails():
-            with sqlite3.connect(DB) as con:
-                mails=",".join(e for e, in con.execute("SELECT email FROM staff"))
-            pv.clipboard_clear(); pv.clipboard_append(mails)
-            messagebox.showinfo("Copied",f"{len(mails.split(','))} addresses copied.",parent=pv)
+            def copy(mails):
+                pv.clipboard_clear(); pv.clipboard_append(mails)
+                messagebox.showinfo("Copied",f"{len(mails.split(','))} addresses copied.",parent=pv)
+            db.submit(lambda con: ",".join(e for e, in con.execute("SELECT email FROM staff")),on_done=copy)
+        def email_schedules():
+            cfg=mailer.config_from_env()
+            if not messagebox.askyesno("Email schedules",
+                                       f"Email each rostered employee their shifts via {cfg.host}:{cfg.port}?",
+                                       parent=pv): return
+            done=[]; result={}
+            def work():
+                try:
+                    result["res"]=mailer.send_roster(rid,db_file=DB,cfg=cfg,on_result=done.append)
+                except Exception as e:
+                    result["error"]=e
+            def poll():
+                mail_status.configure(text=f"Sending… {len(done)} done")
+                if th.is_alive(): pv.after(200,poll); return
+                mail_btn.configure(state="normal"); mail_status.configure(text="")
+                if "error" in result:
+                    messagebox.showerror("Email failed",str(result["error"]),parent=pv); return
+                res=result["res"]; bad=[r for r in res if r.status!="sent"]
+                msg=f"{len(res)-len(bad)} of {len(res)} schedules sent."
+                if bad:
+                    msg+="\n\n"+"\n".join(f"{r.employee}: {r.status} ({r.error})" for r in bad)
+                (messagebox.showwarning if bad else messagebox.showinfo)("Email schedules",msg,parent=pv)
+            mail_btn.configure(state="disabled")
+            th=threading.Thread(target=work,daemon=True); th.start(); poll()
+        def email_changes():
+            people=sorted(roster_diff.by_employee(changes))
+            if not messagebox.askyesno("Email changes",
+                                       f"Send a change notice to {len(people)} employee(s)?\n\n"+", ".join(people),
+                                       parent=pv): return
+            result={}
+            def work():
+                try:
+                    result["res"]=roster_diff.notify(rid,base_rid,db_file=DB)
+                except Exception as e:
+                    result["error"]=e
+            def poll():
+                if th.is_alive(): pv.after(200,poll); return
+                chg_mail_btn.configure(state="normal"); mail_status.configure(text="")
+                if "error" in result:
+                    messagebox.showerror("Email failed",str(result["error"]),parent=pv); return
+                res=result["res"]; bad=[r for r in res if r.status!="sent"]
+                msg=f"{len(res)-len(bad)} of {len(res)} change notices sent."
+                if bad:
+                    msg+="\n\n"+"\n".join(f"{r.employee}: {r.status} ({r.error})" for r in bad)
+                (messagebox.showwarning if bad else messagebox.showinfo)("Email changes",msg,parent=pv)
+            chg_mail_btn.configure(state="disabled"); mail_status.configure(text="Sending change notices…")
+            th=threading.Thread(target=work,daemon=True); th.start(); poll()
+        def staff_pdfs():
+            result={}
+            def work():                      # process pool – keeps the window responsive
+                try:
+                    result["paths"]=employee_pdfs.generate_for_roster(rid,db_file=DB)
+                except Exception as e:
+                    result["error"]=e
+            def poll():
+                if th.is_alive(): pv.after(200,poll); return
+                staff_btn.configure(state="normal"); mail_status.configure(text="")
+                if "error" in result:
+                    messagebox.showerror("Staff PDFs",str(result["error"]),parent=pv); return
+                mail_status.configure(text=f"{len(result['paths'])} staff PDFs saved.")
+                open_host(employee_pdfs.roster_folder(rid))
+            staff_btn.configure(state="disabled"); mail_status.configure(text="Rendering staff PDFs…")
+            th=threading.Thread(target=work,daemon=True); th.start(); poll()
         def open_folder():
             if os.name == "nt":
                 os.startfile(os.path.abspath(ROSTERSDIR))
@@ -532,14 +871,22 @@ def init_roster_tab(tab:tk.Frame):
 
         for txt,cmd,col in (("View",open_pdf,0),
                             ("Copy emails",copy_mails,1),
-                            ("Open folder",open_folder,2),
-                            ("Close",pv.destroy,3)):
-            ttk.Button(bf,text=txt,command=cmd).grid(row=0,column=col,padx=4)
+                            ("Staff PDFs",staff_pdfs,2),
+                            ("Email schedules",email_schedules,3),
+                            ("Email changes",email_changes,4),
+                            ("Open folder",open_folder,5),
+                            ("Close",pv.destroy,6)):
+            b=ttk.Button(bf,text=txt,command=cmd); b.grid(row=0,column=col,padx=4)
+            if cmd is email_schedules: mail_btn=b
+            if cmd is staff_pdfs: staff_btn=b
+            if cmd is email_changes: chg_mail_btn=b
+        if not (base_rid and changes): chg_mail_btn.configure(state="disabled")
+        mail_status=ttk.Label(pv,text=""); mail_status.pack(pady=(0,6))
 
     finalize_btn.configure(command=finalize)
 
     # first draw
-    start_e.set_date(datetime.date.today()); build_week()
+    start_e.set_date(resume_date); build_week()
     start_e.bind("<<DateEntrySelected>>",lambda _ : build_week())
 
 
@@ -554,13 +901,17 @@ def init_password_tab(tab: tk.Frame):
     def chg():
         if new.get()!=cnf.get():
             messagebox.showerror("Err","Mismatch",parent=tab); return
-        with sqlite3.connect(DB) as con:
+        def write(con,old,pw_new):
             pw=con.execute("SELECT password FROM managers WHERE username=?", (current_manager,)).fetchone()
-            if not pw or pw[0]!=cur.get():
+            if not pw or pw[0]!=old: return False
+            con.execute("UPDATE managers SET password=? WHERE username=?", (pw_new,current_manager))
+            return True
+        def done(ok):
+            if not ok:
                 messagebox.showerror("Err","Wrong current",parent=tab); return
-            con.execute("UPDATE managers SET password=? WHERE username=?", (new.get(),current_manager))
-        messagebox.showinfo("OK","Password changed.",parent=tab)
-        for e in (cur,new,cnf): e.delete(0,tk.END)
+            messagebox.showinfo("OK","Password changed.",parent=tab)
+            for e in (cur,new,cnf): e.delete(0,tk.END)
+        db.submit(write,cur.get(),new.get(),on_done=done)
     ttk.Button(tab,text="Change",command=chg).grid(row=3,column=0,columnspan=2,pady=8)
 
 
@@ -589,11 +940,45 @@ def init_help_tab(tab: tk.Frame):
 - Use the start date picker to define the week. The end date auto-fills.
 - View and assign staff duties per day using the 'Add' button. You can also 'Edit' or 'Remove'.
 - Notes can be added for each day.
-- Press 'Finalize Roster' to save and generate a PDF. The file is auto-timestamped to avoid overwrites.
+- Press 'Finalize Roster' to save and generate a PDF. A roster identical to an earlier one reuses that PDF.
+- 'Staff PDFs' (after finalizing) renders a personal schedule PDF for every staff member into Rosters/roster_<id>/.
+- 'Email schedules' (after finalizing) emails every rostered employee their own shifts with their PDF attached.
+    SMTP settings come from ROSTER_SMTP_* environment variables (see mailer.py).
+- Run 'python pdf_store.py prune' to delete PDFs in Rosters/ that no roster refers to (older than 30 days).
+- Templates: 'Save as…' stores the current week under a name (e.g. "School holidays"); saving again makes
+    a new version. Pick one and press 'Apply' to lay it onto the selected week; 'Compare…' shows what differs.
+- The 'Compliance' list under Weekly Hours shows working-time rule issues as you edit: max weekly hours
+    (Max hrs/wk), min 10 h rest between working days, max 6 days in a row, max 12 h shifts, and a
+    30-minute break between back-to-back shifts over 5 h. Adding or editing a duty warns about new issues;
+    Finalize lists them all and asks before saving. (Limits: ROSTER_* variables, see compliance.py.)
+- Database work runs in the background: the status line at the bottom shows "Working…" meanwhile, and
+    the window never freezes. If another program has roster.db locked, the app waits up to 5 seconds
+    (ROSTER_DB_BUSY_TIMEOUT) and then says so instead of hanging.
+- Under each day, 'Suggested' shows how many staff past rosters had on that weekday at each time
+    (recent weeks, the same time of year and past public holidays count most). 'Short' in red marks
+    times the week being built has fewer staff than suggested. Add local holidays with
+    'python forecast.py holiday add YYYY-MM-DD "Name"'.
+- 'Changes…' lists what the week in progress changes compared with the last finalized roster of the same
+    week (added / removed / changed shifts); the count is shown next to it as you edit. After finalizing a
+    revision, 'Email changes' sends a short notice only to the employees whose shifts changed.
+    ('python roster_diff.py show|notify ID' does the same from the command line.)
 - Use the 'Previous' dropdown to load any saved roster (even if the dates are same – timestamp is used).
+    Rosters older than a year are moved to roster_archive.db automatically and show as [archived];
+    they load exactly like the others. ('python archive.py status' shows the split.)
+- 'Export…' writes the selected roster (or all history) as CSV for payroll, per-employee .ics calendars,
+    or an XLSX workbook into Rosters/exports/. The same is available as 'python exporters.py'.
 - DO NOT CHANGE THE START DATE ONCE YOU HAVE LOADED THE PREVIOUS ROSTERS FOR CREATING NEW,
     FIRST SELECT YOUR DESIRED START DATE FOR THE WEEK AND THEN LOAD THE PREVIOUS ROSTER.
 
+💾 Backups:
+- A checked copy of roster.db (and roster_archive.db) is saved to Backups/ once a day while the
+    dashboard is open; the newest 10 are kept. 'python backup.py create | list | restore' does it by hand.
+- If roster.db is ever damaged, the app offers to restore the newest good backup when it starts.
+
+🌐 Sharing the roster (optional):
+- 'python api_server.py --host 0.0.0.0' serves staff, rosters, hours and PDFs read-only over HTTP
+    (e.g. for a break-room tablet: http://<this-pc>:8080/shifts?employee=Your Name).
+
 🔑 Change Password Tab:
 - Change the current admin password after validating the current one.
 
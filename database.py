@@ -14,6 +14,10 @@ def create_tables(conn):
     """Create necessary tables if they do not exist."""
     cursor = conn.cursor()
 
+    # Let archive.py hand free pages back with incremental VACUUM
+    # (only takes effect on a new, empty database file)
+    cursor.execute("PRAGMA auto_vacuum = INCREMENTAL")
+
     # Table for manager credentials
     cursor.execute('''
         CREATE TABLE IF NOT EXISTS managers (
@@ -42,6 +46,7 @@ def create_tables(conn):
             start_date TEXT,
             end_date   TEXT,
             pdf_file   TEXT,  -- Path to the generated PDF file (inside Rosters/)
+            pdf_hash   TEXT,  -- Content hash of the PDF (see pdf_store.py)
             created_at  TEXT DEFAULT CURRENT_TIMESTAMP       
         )
     ''')
@@ -0,0 +1,115 @@
+# db_worker.py  ────────────────────────────────────────────────────────────
+"""
+One background thread that owns the dashboard's SQLite connection.
+
+Tk callbacks never touch SQLite directly: they ``submit(fn, *args,
+on_done=…)`` and return at once.  ``fn(con, *args)`` runs on the worker
+thread inside a transaction (committed on success, rolled back on error);
+its result – or the exception – is handed back on the Tk thread by an
+``after()`` poll, so callbacks may update widgets freely.  Requests run in
+submission order, so a write followed by a read sees its own change.
+
+If another program holds the database lock, SQLite waits up to
+``ROSTER_DB_BUSY_TIMEOUT`` seconds (default 5) before failing the request
+with "database is locked" – on this thread, not in the window.
+
+    db = DBWorker(DB); db.start(root)
+    db.submit(lambda con: con.execute("SELECT name FROM staff").fetchall(),
+              on_done=fill_listbox)
+"""
+
+import os, queue, sqlite3, threading
+import archive
+
+BASE_DIR     = os.path.dirname(os.path.abspath(__file__))
+DB_FILE      = os.path.join(BASE_DIR, "roster.db")
+BUSY_TIMEOUT = float(os.environ.get("ROSTER_DB_BUSY_TIMEOUT", "5"))    # seconds
+POLL_MS      = 25           # how often the Tk side collects finished requests
+
+
+class DBWorker:
+    def __init__(self, db_file=DB_FILE, *, busy_timeout=BUSY_TIMEOUT, on_busy=None, on_error=None):
+        self.db_file, self.busy_timeout = db_file, busy_timeout
+        self.on_busy  = on_busy             # on_busy(True/False) when work starts / all done
+        self.on_error = on_error            # default handler for requests without on_error
+        self.requests, self.replies = queue.Queue(), queue.Queue()
+        self.pending, self.widget = 0, None
+        self.thread = threading.Thread(target=self._run, name="roster-db", daemon=True)
+
+    # ─────────────── Tk side ─────────────────────────────────────────────
+    def start(self, widget):
+        """Start the thread; results are delivered through ``widget.after``."""
+        self.widget = widget
+        self.thread.start()
+        self._poll()
+
+    def submit(self, fn, *args, on_done=None, on_error=None):
+        """Queue ``fn(con, *args)``; ``on_done(result)`` / ``on_error(exc)`` run on the Tk thread."""
+        self.pending += 1
+        if self.pending == 1 and self.on_busy:
+            self.on_busy(True)
+        self.requests.put((fn, args, on_done, on_error))
+
+    def busy(self):
+        return self.pending > 0
+
+    def _poll(self):
+        try:
+            while True:
+                try:
+                    callback, value, error = self.replies.get_nowait()
+                except queue.Empty:
+                    break
+                self.pending -= 1
+                try:
+                    if error is not None:
+                        (callback or self.on_error or _report)(error)
+                    elif callback:
+                        callback(value)
+                except Exception as e:              # a broken callback must not stop the poll
+                    print(f"DB callback failed: {e}")
+                if self.pending == 0 and self.on_busy:
+                    self.on_busy(False)
+        finally:
+            self.widget.after(POLL_MS, self._poll)
+
+    def stop(self):
+        self.requests.put(None)
+
+    # ─────────────── worker thread ───────────────────────────────────────
+    def _connect(self):
+        con = archive.connect(self.db_file, timeout=self.busy_timeout)
+        con.execute(f"PRAGMA busy_timeout = {int(self.busy_timeout * 1000)}")
+        return con
+
+    def _run(self):
+        con = None
+        try:
+            while True:
+                item = self.requests.get()
+                if item is None:
+                    return
+                fn, args, on_done, on_error = item
+                try:
+                    if con is not None and archive.stale(con, self.db_file):
+                        con.close(); con = None     # first archiving created roster_archive.db
+                    if con is None:             # (re)opened lazily – a locked DB fails one request only
+                        con = self._connect()
+                    with con:
+                        result = fn(con, *args)
+                    self.replies.put((on_done, result, None))
+                except Exception as e:
+                    self.replies.put((on_error, None, e))
+        finally:
+            if con is not None:
+                con.close()
+
+
+def _report(error):
+    print(f"DB request failed: {error}")
+
+
+def is_locked(error):
+    """True for SQLite's 'database is locked' / 'busy' failures."""
+    return isinstance(error, sqlite3.OperationalError) and \
+        any(w in str(error).lower() for w in ("locked", "busy"))
@@ -0,0 +1,252 @@
+# drafts.py  ───────────────────────────────────────────────────────────────
+"""
+Crash-safe draft autosave for the roster tab.
+
+Every change to the weekday template (``global_duties``) and the per-date
+notes (``special_notes``) is recorded as a small, invertible operation in a
+journal.  The journal
+
+* drives unlimited undo / redo (ops are inverted, never re-snapshotted), and
+* is written behind to SQLite by a daemon thread.  Bursts of edits are
+  coalesced on a short debounce, so the Tk event loop never touches the disk.
+
+On the next login ``DraftJournal.load()`` replays the persisted ops and the
+manager is back where they left off.
+
+Operation shapes (all JSON-serialisable):
+    {"op": "add",     "wd": wd, "idx": i, "duty": {...}}
+    {"op": "remove",  "wd": wd, "idx": i, "duty": {...}}
+    {"op": "edit",    "wd": wd, "idx": i, "old": {...}, "new": {...}}
+    {"op": "note",    "ds": ds, "old": str, "new": str}
+    {"op": "replace", "old": state, "new": state}
+        state = {"duties": {wd: [duty, ...]}, "notes": {ds: str}}  (notes optional)
+"""
+
+import os, json, sqlite3, threading, datetime
+
+BASE_DIR         = os.path.dirname(os.path.abspath(__file__))
+DB_FILE          = os.path.join(BASE_DIR, "roster.db")
+DEBOUNCE_SECONDS = 0.75
+
+
+def ensure_schema(con):
+    """Create the draft tables if they do not exist."""
+    con.execute("""
+        CREATE TABLE IF NOT EXISTS draft (
+            owner      TEXT PRIMARY KEY,   -- manager username
+            start_date TEXT,               -- YYYY-MM-DD shown in the roster tab
+            cursor     INTEGER NOT NULL,   -- number of journal ops currently applied
+            updated_at TEXT
+        )
+    """)
+    con.execute("""
+        CREATE TABLE IF NOT EXISTS draft_ops (
+            owner TEXT    NOT NULL,
+            seq   INTEGER NOT NULL,        -- position in the journal (0-based)
+            op    TEXT    NOT NULL,        -- JSON encoded operation
+            PRIMARY KEY (owner, seq)
+        )
+    """)
+    con.commit()
+
+
+def snapshot(duties, notes=None):
+    """Deep-copy the template (and optionally notes) for a ``replace`` op."""
+    state = {"duties": {wd: [dict(d) for d in lst] for wd, lst in duties.items()}}
+    if notes is not None:
+        state["notes"] = dict(notes)
+    return state
+
+
+class DraftJournal:
+    """Operation journal over a weekday template + notes, persisted write-behind."""
+
+    def __init__(self, duties, notes, *, owner, db_file=DB_FILE,
+                 debounce=DEBOUNCE_SECONDS):
+        self.duties, self.notes = duties, notes
+        self.owner, self.db_file, self.debounce = owner, db_file, debounce
+        self.ops, self.cursor = [], 0
+        self.start_date = None
+
+        self._lock       = threading.Lock()
+        self._dirty_from = None           # lowest journal index not yet on disk
+        self._meta_dirty = False          # cursor / start date changed
+        self._wake       = threading.Event()
+        self._stop       = threading.Event()
+        self._writer     = None
+
+    # ─────────────── persistence ─────────────────────────────────────────
+    def load(self):
+        """Restore the persisted draft into ``duties``/``notes``; start the writer.
+
+        Returns True when a draft was found.
+        """
+        with sqlite3.connect(self.db_file) as con:
+            ensure_schema(con)
+            row = con.execute("SELECT start_date,cursor FROM draft WHERE owner=?",
+                              (self.owner,)).fetchone()
+            ops = [json.loads(op) for op, in con.execute(
+                "SELECT op FROM draft_ops WHERE owner=? ORDER BY seq", (self.owner,))]
+        con.close()
+
+        if row:
+            self.start_date, cursor = row
+            self.ops = ops
+            self.cursor = min(cursor, len(ops))
+            for op in self.ops[:self.cursor]:
+                self._apply(op)
+
+        self._writer = threading.Thread(target=self._run, name="draft-writer", daemon=True)
+        self._writer.start()
+        return bool(row)
+
+    def close(self, timeout=5.0):
+        """Flush anything pending and stop the writer thread."""
+        if self._writer is None:
+            return
+        self._stop.set(); self._wake.set()
+        self._writer.join(timeout)
+        self._writer = None
+
+    def _run(self):
+        con = sqlite3.connect(self.db_file, timeout=10)
+        try:
+            while not self._stop.is_set():
+                self._wake.wait()
+                # debounce: let a burst of edits pile up, then write them once
+                self._stop.wait(self.debounce)
+                self._wake.clear()
+                self._flush(con)
+            self._flush(con)
+        finally:
+            con.close()
+
+    def _flush(self, con):
+        with self._lock:
+            if self._dirty_from is None and not self._meta_dirty:
+                return
+            start   = len(self.ops) if self._dirty_from is None else self._dirty_from
+            pending = [(i, json.dumps(op)) for i, op in enumerate(self.ops[start:], start)]
+            cursor, start_date, empty = self.cursor, self.start_date, not self.ops
+            self._dirty_from, self._meta_dirty = None, False
+
+        try:
+            with con:
+                con.execute("DELETE FROM draft_ops WHERE owner=? AND seq>=?", (self.owner, start))
+                con.executemany("INSERT INTO draft_ops(owner,seq,op) VALUES(?,?,?)",
+                                [(self.owner, i, op) for i, op in pending])
+                if empty:
+                    con.execute("DELETE FROM draft WHERE owner=?", (self.owner,))
+                else:
+                    con.execute("""INSERT OR REPLACE INTO draft(owner,start_date,cursor,updated_at)
+                                   VALUES(?,?,?,?)""",
+                                (self.owner, start_date, cursor,
+                                 datetime.datetime.now().isoformat(timespec="seconds")))
+        except sqlite3.Error as e:
+            print(f"Draft autosave failed, will retry: {e}")
+            with self._lock:
+                self._dirty_from = start if self._dirty_from is None else min(start, self._dirty_from)
+                self._meta_dirty = True
+            if not self._stop.is_set():
+                self._wake.set()
+
+    def _mark(self, from_idx=None):
+        with self._lock:
+            if from_idx is not None:
+                self._dirty_from = from_idx if self._dirty_from is None \
+                                   else min(from_idx, self._dirty_from)
+            self._meta_dirty = True
+        self._wake.set()
+
+    # ─────────────── journal ─────────────────────────────────────────────
+    def record(self, op):
+        """Apply ``op`` and append it to the journal (drops any redo tail)."""
+        self._apply(op)
+        with self._lock:
+            del self.ops[self.cursor:]
+            self.ops.append(op)
+            self.cursor += 1
+        self._mark(self.cursor - 1)
+
+    def can_undo(self):
+        return self.cursor > 0
+
+    def can_redo(self):
+        return self.cursor < len(self.ops)
+
+    def undo(self):
+        if not self.can_undo():
+            return False
+        with self._lock:
+            self.cursor -= 1
+        self._apply(self.ops[self.cursor], undo=True)
+        self._mark()
+        return True
+
+    def redo(self):
+        if not self.can_redo():
+            return False
+        self._apply(self.ops[self.cursor])
+        with self._lock:
+            self.cursor += 1
+        self._mark()
+        return True
+
+    def set_start(self, ds):
+        """Remember the week start date shown in the roster tab."""
+        if ds != self.start_date:
+            self.start_date = ds
+            if self.ops:
+                self._mark()
+
+    def reset(self):
+        """Forget the journal and the persisted draft (e.g. after finalize).
+
+        The in-memory template is kept so the next week can start from it.
+        """
+        with self._lock:
+            self.ops.clear(); self.cursor = 0
+        self._mark(0)
+
+    # ─────────────── convenience constructors ────────────────────────────
+    def add(self, wd, duty):
+        self.record({"op": "add", "wd": wd, "idx": len(self.duties[wd]), "duty": dict(duty)})
+
+    def remove(self, wd, idx):
+        self.record({"op": "remove", "wd": wd, "idx": idx, "duty": dict(self.duties[wd][idx])})
+
+    def edit(self, wd, idx, new):
+        self.record({"op": "edit", "wd": wd, "idx": idx,
+                     "old": dict(self.duties[wd][idx]), "new": dict(new)})
+
+    def note(self, ds, text):
+        old = self.notes.get(ds, "")
+        if text != old:
+            self.record({"op": "note", "ds": ds, "old": old, "new": text})
+
+    def replace(self, duties, notes=None):
+        """Swap in a whole new template (Start New, load previous, ...)."""
+        old = snapshot(self.duties, None if notes is None else self.notes)
+        self.record({"op": "replace", "old": old, "new": snapshot(duties, notes)})
+
+    # ─────────────── apply / invert ──────────────────────────────────────
+    def _apply(self, op, undo=False):
+        kind = op["op"]
+        if kind == "add" or kind == "remove":
+            lst = self.duties[op["wd"]]
+            if (kind == "add") != undo:
+                lst.insert(op["idx"], dict(op["duty"]))
+            else:
+                lst.pop(op["idx"])
+        elif kind == "edit":
+            self.duties[op["wd"]][op["idx"]] = dict(op["old"] if undo else op["new"])
+        elif kind == "note":
+            self.notes[op["ds"]] = op["old"] if undo else op["new"]
+        elif kind == "replace":
+            state = op["old"] if undo else op["new"]
+            for wd, lst in self.duties.items():
+                lst[:] = [dict(d) for d in state["duties"].get(wd, [])]
+            if "notes" in state:
+                self.notes.clear(); self.notes.update(state["notes"])
+        else:
+            raise ValueError(f"Unknown draft op: {kind}")
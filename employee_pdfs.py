@@ -0,0 +1,93 @@
+# employee_pdfs.py  ────────────────────────────────────────────────────────
+"""
+One schedule PDF per staff member for a finalized roster.
+
+Files go to ``Rosters/roster_<id>/<employee>.pdf``; names that sanitize to
+the same file get a suffix (``roster_data.file_stems``) and ``index.json``
+in the folder records which file belongs to whom, so the mailer attaches
+exactly what was rendered.  Rendering is spread over a process pool (see
+``pdf_generator.generate_employee_pdfs``); each worker builds the shared
+styles once and reuses them for every PDF it draws.
+
+Command line:
+    python employee_pdfs.py --roster ID [--processes N]
+"""
+
+import os, json, time, argparse
+import pdf_generator
+import roster_data
+import archive
+
+BASE_DIR    = os.path.dirname(os.path.abspath(__file__))
+DB_FILE     = os.path.join(BASE_DIR, "roster.db")
+ROSTERS_DIR = os.path.join(BASE_DIR, "Rosters")
+
+
+def roster_folder(roster_id):
+    return os.path.join(ROSTERS_DIR, f"roster_{roster_id}")
+
+
+def rendered(roster_id):
+    """{employee: PDF path} from the folder's index.json ({} if not rendered yet)."""
+    try:
+        with open(os.path.join(roster_folder(roster_id), "index.json"), encoding="utf-8") as fh:
+            files = json.load(fh)
+    except (OSError, ValueError):
+        return {}
+    return {e: os.path.join(roster_folder(roster_id), f) for e, f in files.items()}
+
+
+def pdf_path(roster_id, employee):
+    """Where the personal schedule of ``employee`` for ``roster_id`` lives, or None."""
+    return rendered(roster_id).get(employee)
+
+
+def write_index(roster_id, paths):
+    """Record {employee: path} as ``index.json`` (replaced atomically)."""
+    folder = roster_folder(roster_id)
+    tmp = os.path.join(folder, "index.json.part")
+    with open(tmp, "w", encoding="utf-8") as fh:
+        json.dump({e: os.path.basename(p) for e, p in paths.items()}, fh, ensure_ascii=False, indent=1)
+    os.replace(tmp, os.path.join(folder, "index.json"))
+
+
+def build_jobs(con, roster_id):
+    """Keyword-argument dicts for ``generate_employee_pdf``, one per staff member."""
+    sd, ed = roster_data.roster_bounds(con, roster_id)
+    title = f"BP Eltham roster from {sd} to {ed}"
+    jobs = {}
+    for employee, _email, duties, total in roster_data.employee_schedules(con, roster_id):
+        rows = [(roster_data.weekday(d.duty_date), d.duty_date, f"{d.start}-{d.end}",
+                 roster_data.duration_hours(d.start, d.end), d.note or "") for d in duties]
+        jobs[employee] = dict(employee=employee, rows=rows, total=total, title=title)
+    # everyone on staff gets a sheet, even in a week without shifts
+    for name, in con.execute("SELECT name FROM staff ORDER BY name"):
+        jobs.setdefault(name, dict(employee=name, rows=[], total=0.0, title=title))
+    stems = roster_data.file_stems(jobs)
+    for name, job in jobs.items():
+        job["filename"] = os.path.join(roster_folder(roster_id), stems[name] + ".pdf")
+    return list(jobs.values())
+
+
+def generate_for_roster(roster_id, *, db_file=DB_FILE, processes=None):
+    """Render every staff member's PDF for ``roster_id``; returns the file paths."""
+    with archive.connect(db_file) as con:
+        if not roster_data.roster_bounds(con, roster_id):
+            raise ValueError(f"No roster with id {roster_id}")
+        jobs = build_jobs(con, roster_id)
+    os.makedirs(roster_folder(roster_id), exist_ok=True)
+    paths = pdf_generator.generate_employee_pdfs(jobs, processes=processes)
+    write_index(roster_id, {j["employee"]: j["filename"] for j in jobs})
+    return paths
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Per-employee schedule PDFs")
+    ap.add_argument("--roster", type=int, required=True)
+    ap.add_argument("--processes", type=int, help="pool size (1 = render serially)")
+    args = ap.parse_args()
+
+    t0 = time.perf_counter()
+    paths = generate_for_roster(args.roster, processes=args.processes)
+    print(f"[✔] {len(paths)} PDFs in {roster_folder(args.roster)} "
+          f"({time.perf_counter() - t0:.2f}s)")
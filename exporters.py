@@ -0,0 +1,178 @@
+# exporters.py  ────────────────────────────────────────────────────────────
+"""
+Streaming exports of finalized rosters.
+
+* CSV  – one line per duty, for payroll
+* ICS  – one iCalendar file per employee
+* XLSX – one sheet, written by XlsxWriter in ``constant_memory`` mode
+
+Every exporter pulls rows one at a time from ``roster_data.iter_duties``, so
+exporting the full history for an audit uses the same memory as exporting a
+single week.
+
+Command line:
+    python exporters.py csv  (--roster ID | --all) -o payroll.csv
+    python exporters.py ics  (--roster ID | --all) -o calendars/
+    python exporters.py xlsx (--roster ID | --all) -o roster.xlsx
+"""
+
+import os, csv, datetime, argparse
+import roster_data
+import archive
+
+try:
+    import xlsxwriter
+except ImportError:                      # optional – only needed for .xlsx
+    xlsxwriter = None
+
+BASE_DIR    = os.path.dirname(os.path.abspath(__file__))
+DB_FILE     = os.path.join(BASE_DIR, "roster.db")
+EXPORTS_DIR = os.path.join(BASE_DIR, "Rosters", "exports")
+
+COLUMNS = ["Roster", "Date", "Day", "Employee", "Start", "End", "Hours", "Note"]
+
+
+def _rows(con, roster_id, order="date"):
+    """Duties as flat export rows (generator)."""
+    for d in roster_data.iter_duties(con, roster_id, order=order):
+        yield [d.roster_id, d.duty_date, roster_data.weekday(d.duty_date), d.employee,
+               d.start, d.end, round(roster_data.duration_hours(d.start, d.end), 2),
+               d.note or ""]
+
+
+# ─────────────────────────── CSV ──────────────────────────────────────────
+def export_csv(path, roster_id=None, *, db_file=DB_FILE):
+    """Write a payroll CSV; returns the number of duties written."""
+    n = 0
+    with archive.connect(db_file) as con, open(path, "w", newline="", encoding="utf-8") as fh:
+        w = csv.writer(fh)
+        w.writerow(COLUMNS)
+        for row in _rows(con, roster_id):
+            w.writerow(row); n += 1
+    return n
+
+
+# ─────────────────────────── iCalendar ────────────────────────────────────
+def _ics_escape(text):
+    return (text.replace("\\", "\\\\").replace(";", "\\;")
+                .replace(",", "\\,").replace("\n", "\\n"))
+
+
+def _ics_fold(line):
+    """RFC 5545 line folding (75 octets, continuation lines start with a space)."""
+    raw = line.encode("utf-8")
+    if len(raw) <= 75:
+        return line + "\r\n"
+    out, chunk = [], b""
+    for ch in line:
+        b = ch.encode("utf-8")
+        if len(chunk) + len(b) > (75 if not out else 74):
+            out.append(chunk.decode("utf-8")); chunk = b""
+        chunk += b
+    out.append(chunk.decode("utf-8"))
+    return "\r\n ".join(out) + "\r\n"
+
+
+def _ics_stamp(ds, hhmm):
+    return ds.replace("-", "") + "T" + hhmm.replace(":", "") + "00"
+
+
+def export_ics(out_dir, roster_id=None, *, db_file=DB_FILE):
+    """Write ``<employee>.ics`` per employee into ``out_dir``; returns the file paths.
+
+    Duties arrive sorted by employee, so only one calendar file is open at a time.
+    Names that sanitize to the same file name get a suffix (``Ann_2.ics``).
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    now = datetime.datetime.now(datetime.timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    paths, fh, current, stem, used = [], None, None, None, set()
+
+    def close():
+        if fh:
+            fh.write("END:VCALENDAR\r\n"); fh.close()
+
+    with archive.connect(db_file) as con:
+        try:
+            for d in roster_data.iter_duties(con, roster_id, order="employee"):
+                if d.employee != current:
+                    close()
+                    current = d.employee
+                    stem = roster_data.unique_stem(current, used)
+                    path = os.path.join(out_dir, stem + ".ics")
+                    fh = open(path, "w", encoding="utf-8", newline="")
+                    paths.append(path)
+                    fh.write("BEGIN:VCALENDAR\r\nVERSION:2.0\r\n"
+                             "PRODID:-//BP Eltham//Roster//EN\r\nCALSCALE:GREGORIAN\r\n")
+                    fh.write(_ics_fold("X-WR-CALNAME:" + _ics_escape(f"Shifts – {current}")))
+
+                end_ds = d.duty_date
+                if d.end <= d.start:            # shift runs past midnight
+                    end_ds = (datetime.date.fromisoformat(d.duty_date)
+                              + datetime.timedelta(days=1)).isoformat()
+                fh.write("BEGIN:VEVENT\r\n")
+                fh.write(_ics_fold(f"UID:{d.roster_id}-{d.duty_date}-{d.start}-"
+                                   f"{stem}@bp-roster"))
+                fh.write(f"DTSTAMP:{now}\r\n")
+                fh.write(f"DTSTART:{_ics_stamp(d.duty_date, d.start)}\r\n")
+                fh.write(f"DTEND:{_ics_stamp(end_ds, d.end)}\r\n")
+                fh.write("SUMMARY:BP Eltham shift\r\n")
+                if d.note:
+                    fh.write(_ics_fold("DESCRIPTION:" + _ics_escape(d.note)))
+                fh.write("END:VEVENT\r\n")
+        finally:
+            close()
+    return paths
+
+
+# ─────────────────────────── XLSX ─────────────────────────────────────────
+def export_xlsx(path, roster_id=None, *, db_file=DB_FILE):
+    """Write an XLSX workbook row by row; returns the number of duties written."""
+    if xlsxwriter is None:
+        raise RuntimeError("xlsxwriter not installed.\n$  pip install XlsxWriter")
+    wb = xlsxwriter.Workbook(path, {"constant_memory": True})
+    try:
+        ws = wb.add_worksheet("Duties")
+        bold = wb.add_format({"bold": True})
+        ws.set_column(1, 3, 14); ws.set_column(7, 7, 40)
+        ws.write_row(0, 0, COLUMNS, bold)
+        n = 0
+        with archive.connect(db_file) as con:
+            for n, row in enumerate(_rows(con, roster_id), 1):
+                ws.write_row(n, 0, row)           # rows must arrive in order
+        ws.freeze_panes(1, 0)
+    finally:
+        wb.close()
+    return n
+
+
+EXPORTERS = {"csv": export_csv, "ics": export_ics, "xlsx": export_xlsx}
+
+
+def default_target(fmt, roster_id=None):
+    """Where the dashboard puts an export: Rosters/exports/<name>[.ext]"""
+    stamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+    name = f"roster_{roster_id}" if roster_id is not None else f"history_{stamp}"
+    return os.path.join(EXPORTS_DIR, name if fmt == "ics" else f"{name}.{fmt}")
+
+
+def export(fmt, target=None, roster_id=None, *, db_file=DB_FILE):
+    """Run one exporter; returns the path written (file or folder)."""
+    target = target or default_target(fmt, roster_id)
+    if fmt != "ics":
+        os.makedirs(os.path.dirname(os.path.abspath(target)), exist_ok=True)
+    EXPORTERS[fmt](target, roster_id, db_file=db_file)
+    return target
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Export finalized rosters")
+    ap.add_argument("format", choices=sorted(EXPORTERS))
+    scope = ap.add_mutually_exclusive_group(required=True)
+    scope.add_argument("--roster", type=int, help="roster_id to export")
+    scope.add_argument("--all", action="store_true", help="export the whole history")
+    ap.add_argument("-o", "--output", help="file (csv/xlsx) or folder (ics)")
+    ap.add_argument("--db", default=DB_FILE)
+    args = ap.parse_args()
+
+    out = export(args.format, args.output, None if args.all else args.roster, db_file=args.db)
+    print(f"[✔] Exported to {out}")
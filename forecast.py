@@ -0,0 +1,262 @@
+# forecast.py  ─────────────────────────────────────────────────────────────
+"""
+Suggested staffing for a coming week, learned from past rosters.
+
+Every finalized week (latest revision per start date) is reduced once to a
+headcount curve per date: 96 quarter-hour slots, built with a difference
+array (+1 at shift start, -1 at shift end, running sum).  The curves are
+cached in ``forecast_day``; ``update_cache()`` only processes rosters it has
+not seen before, so finalizing a week costs one week of work, not a rescan of
+the whole history.
+
+A forecast for a date is the weighted mean of the cached curves for the same
+weekday:
+
+    recency   weight halves every HALF_LIFE_WEEKS weeks
+    season    × SEASON_BOOST for days within SEASON_WINDOW days of the same
+              time of year (any year)
+    holidays  a public holiday learns from past holidays (× HOLIDAY_BOOST);
+              an ordinary day mostly ignores them (× HOLIDAY_DAMP)
+
+Holidays live in the ``holiday`` table (New Zealand's fixed-date public
+holidays are always included); add moving ones – Easter, King's Birthday,
+Matariki, Labour Day, Taranaki Anniversary – from the command line.
+
+Command line:
+    python forecast.py show [--start YYYY-MM-DD]      (default: next Sunday)
+    python forecast.py rebuild
+    python forecast.py holiday add YYYY-MM-DD "Taranaki Anniversary"
+    python forecast.py holiday list
+"""
+
+import os, datetime, argparse
+import archive
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DB_FILE  = os.path.join(BASE_DIR, "roster.db")
+
+SLOT_MIN        = 15
+SLOTS           = 24 * 60 // SLOT_MIN
+HALF_LIFE_WEEKS = 12
+SEASON_WINDOW   = 21        # days either side of the same day of year
+SEASON_BOOST    = 2.0
+HOLIDAY_BOOST   = 4.0
+HOLIDAY_DAMP    = 0.1
+FIXED_HOLIDAYS  = {(1, 1): "New Year's Day", (1, 2): "Day after New Year's Day",
+                   (2, 6): "Waitangi Day", (4, 25): "Anzac Day",
+                   (12, 25): "Christmas Day", (12, 26): "Boxing Day"}     # New Zealand
+
+
+def ensure_schema(con):
+    con.execute("""
+        CREATE TABLE IF NOT EXISTS main.forecast_day (
+            duty_date TEXT PRIMARY KEY,
+            roster_id INTEGER,
+            weekday   INTEGER,          -- 0=Sunday … 6=Saturday (strftime %w)
+            coverage  BLOB              -- SLOTS bytes: staff on duty per quarter hour
+        )
+    """)
+    con.execute("CREATE TABLE IF NOT EXISTS main.forecast_source (roster_id INTEGER PRIMARY KEY)")
+    con.execute("""
+        CREATE TABLE IF NOT EXISTS main.holiday (
+            holiday_date TEXT PRIMARY KEY,
+            name         TEXT
+        )
+    """)
+    con.commit()
+
+
+# ─────────────────────────── curves ───────────────────────────────────────
+def _slot(hhmm, up=False):
+    h, m = hhmm.split(":")
+    mins = int(h) * 60 + int(m)
+    return -(-mins // SLOT_MIN) if up else mins // SLOT_MIN
+
+
+def coverage(shifts):
+    """[(start 'HH:MM', end 'HH:MM'), …] → headcount per slot (difference array + running sum)."""
+    delta = [0] * (SLOTS + 1)
+    for st, et in shifts:
+        a, b = _slot(st), _slot(et, up=True)
+        if b <= a:                      # runs past midnight – count it up to midnight
+            b = SLOTS
+        delta[a] += 1; delta[b] -= 1
+    out, run = [], 0
+    for d in delta[:SLOTS]:
+        run += d; out.append(run)
+    return out
+
+
+def update_cache(con):
+    """Cache curves for finalized weeks not seen yet (``con`` from ``archive.connect()``).
+
+    Returns the roster ids processed.  A newer revision of a week replaces the
+    older revision's days.
+    """
+    ensure_schema(con)
+    new = con.execute("""SELECT r.roster_id,r.start_date,r.end_date FROM all_roster r
+                          WHERE r.roster_id=(SELECT MAX(roster_id) FROM all_roster
+                                              WHERE start_date=r.start_date)
+                            AND r.roster_id NOT IN (SELECT roster_id FROM forecast_source)
+                          ORDER BY r.roster_id""").fetchall()
+    for rid, sd, ed in new:
+        days = {}
+        for ds, st, et in con.execute("""SELECT duty_date,start_time,end_time FROM all_roster_duties
+                                          WHERE roster_id=?""", (rid,)):
+            days.setdefault(ds, []).append((st, et))
+        d, last = datetime.date.fromisoformat(sd), datetime.date.fromisoformat(ed or sd)
+        while d <= last:                # days without duties are real zero-coverage days
+            days.setdefault(d.isoformat(), [])
+            d += datetime.timedelta(days=1)
+        con.executemany("""INSERT INTO forecast_day(duty_date,roster_id,weekday,coverage)
+                           VALUES(?,?,?,?)
+                           ON CONFLICT(duty_date) DO UPDATE
+                              SET roster_id=excluded.roster_id, coverage=excluded.coverage
+                            WHERE excluded.roster_id >= forecast_day.roster_id""",
+                        [(ds, rid, (datetime.date.fromisoformat(ds).weekday() + 1) % 7,
+                          bytes(min(c, 255) for c in coverage(shifts)))
+                         for ds, shifts in days.items()])
+        con.execute("INSERT INTO forecast_source(roster_id) VALUES(?)", (rid,))
+    con.commit()
+    return [rid for rid, _, _ in new]
+
+
+def rebuild(con):
+    """Drop the cache and process every week again.
+
+    Not needed after adding holidays – those are applied when forecasting.
+    """
+    ensure_schema(con)
+    con.execute("DELETE FROM forecast_day"); con.execute("DELETE FROM forecast_source")
+    return update_cache(con)
+
+
+# ─────────────────────────── weighting ────────────────────────────────────
+def holidays(con):
+    """{date string: name} from the holiday table."""
+    ensure_schema(con)
+    return dict(con.execute("SELECT holiday_date,name FROM holiday"))
+
+
+def is_holiday(day, table):
+    return day.isoformat() in table or (day.month, day.day) in FIXED_HOLIDAYS
+
+
+def _season_gap(a, b):
+    """Days between two dates' positions in the year (wraps around New Year)."""
+    gap = abs(a.timetuple().tm_yday - b.timetuple().tm_yday)
+    return min(gap, 365 - gap)
+
+
+def weight(target, day, target_holiday, day_holiday):
+    age = (target - day).days
+    w = 0.5 ** (age / (HALF_LIFE_WEEKS * 7))
+    if _season_gap(target, day) <= SEASON_WINDOW:
+        w *= SEASON_BOOST
+    if day_holiday:
+        w *= HOLIDAY_BOOST if target_holiday else HOLIDAY_DAMP
+    return w
+
+
+def forecast_day(con, target, hol=None):
+    """Expected headcount per slot for ``target`` (a date), or None without history."""
+    hol = holidays(con) if hol is None else hol
+    t_hol = is_holiday(target, hol)
+    total, acc = 0.0, [0.0] * SLOTS
+    for ds, cov in con.execute("""SELECT duty_date,coverage FROM forecast_day
+                                   WHERE weekday=? AND duty_date<?""",
+                               ((target.weekday() + 1) % 7, target.isoformat())):
+        day = datetime.date.fromisoformat(ds)
+        w = weight(target, day, t_hol, is_holiday(day, hol))
+        acc = [a + w * c for a, c in zip(acc, cov)]
+        total += w
+    return [a / total for a in acc] if total else None
+
+
+def forecast_week(con, start_date):
+    """{date string: {"curve": [float]*SLOTS, "target": [int]*SLOTS, "holiday": bool}} for 7 days.
+
+    Brings the cache up to date first.  Dates without history are left out.
+    """
+    update_cache(con)
+    hol = holidays(con)
+    out = {}
+    for i in range(7):
+        day = start_date + datetime.timedelta(days=i)
+        curve = forecast_day(con, day, hol)
+        if curve is not None:
+            out[day.isoformat()] = {"curve": curve, "target": targets(curve),
+                                    "holiday": is_holiday(day, hol)}
+    return out
+
+
+# ─────────────────────────── suggestions ──────────────────────────────────
+def targets(curve):
+    """Expected headcount → suggested staff per slot (rounded half up)."""
+    return [int(c + 0.5) for c in curve]
+
+
+def _hhmm(slot):
+    return f"{slot * SLOT_MIN // 60:02d}:{slot * SLOT_MIN % 60:02d}"
+
+
+def blocks(counts):
+    """[(start 'HH:MM', end 'HH:MM', n)] for runs of equal, non-zero counts."""
+    out, i = [], 0
+    while i < len(counts):
+        j = i
+        while j < len(counts) and counts[j] == counts[i]:
+            j += 1
+        if counts[i] > 0:
+            out.append((_hhmm(i), _hhmm(j) if j < SLOTS else "24:00", counts[i]))
+        i = j
+    return out
+
+
+def shortfall(target, actual):
+    """Blocks where the roster has fewer staff than suggested: [(start, end, missing)]."""
+    return blocks([max(t - a, 0) for t, a in zip(target, actual)])
+
+
+def describe(counts):
+    return ", ".join(f"{a}-{b} ×{n}" for a, b, n in blocks(counts)) or "none"
+
+
+def next_sunday(today=None):
+    today = today or datetime.date.today()
+    return today + datetime.timedelta(days=(6 - today.weekday()) or 7)
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Staffing forecast from roster history")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    sp = sub.add_parser("show"); sp.add_argument("--start", type=datetime.date.fromisoformat)
+    sub.add_parser("rebuild", help="recompute the cached daily curves from scratch")
+    hp = sub.add_parser("holiday"); hsub = hp.add_subparsers(dest="action", required=True)
+    ha = hsub.add_parser("add"); ha.add_argument("date", type=datetime.date.fromisoformat); ha.add_argument("name")
+    hsub.add_parser("list")
+    args = ap.parse_args()
+
+    con = archive.connect(DB_FILE)
+    try:
+        if args.cmd == "show":
+            start = args.start or next_sunday()
+            fc = forecast_week(con, start)
+            for i in range(7):
+                day = start + datetime.timedelta(days=i); f = fc.get(day.isoformat())
+                print(f"{day:%A} {day}{' (holiday)' if f and f['holiday'] else ''}: "
+                      f"{describe(f['target']) if f else 'no history'}")
+        elif args.cmd == "rebuild":
+            print(f"[✔] {len(rebuild(con))} week(s) cached")
+        elif args.action == "add":
+            ensure_schema(con)
+            with con:
+                con.execute("INSERT OR REPLACE INTO holiday(holiday_date,name) VALUES(?,?)",
+                            (args.date.isoformat(), args.name))
+            print(f"[✔] {args.date} {args.name}")
+        else:
+            for ds, name in sorted(holidays(con).items()):
+                print(ds, name)
+            print("(always:", ", ".join(FIXED_HOLIDAYS.values()) + ")")
+    finally:
+        con.close()
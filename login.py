@@ -33,24 +33,31 @@ def login():
     else:
         messagebox.showerror("Login Failed", "Incorrect username or password. Please try again.")
 
-# Create the login window
-root = tk.Tk()
-root.title("Manager Login")
-
-# Username label and entry with placeholder
-tk.Label(root, text="Username:").grid(row=0, column=0, padx=10, pady=10)
-username_entry = tk.Entry(root)
-username_entry.grid(row=0, column=1, padx=10, pady=10)
-username_entry.insert(0,"")
-
-# Password label and entry with placeholder (using '*' for password entry)
-tk.Label(root, text="Password:").grid(row=1, column=0, padx=10, pady=10)
-password_entry = tk.Entry(root, show="*")
-password_entry.grid(row=1, column=1, padx=10, pady=10)
-password_entry.insert(0,"")
-
-# Login button that triggers the login function
-login_button = tk.Button(root, text="Login", command=login)
-login_button.grid(row=2, column=0, columnspan=2, pady=20)
-
-root.mainloop()
+def main():
+    """Build and run the login window."""
+    global root, username_entry, password_entry
+    # Create the login window
+    root = tk.Tk()
+    root.title("Manager Login")
+
+    # Username label and entry with placeholder
+    tk.Label(root, text="Username:").grid(row=0, column=0, padx=10, pady=10)
+    username_entry = tk.Entry(root)
+    username_entry.grid(row=0, column=1, padx=10, pady=10)
+    username_entry.insert(0,"")
+
+    # Password label and entry with placeholder (using '*' for password entry)
+    tk.Label(root, text="Password:").grid(row=1, column=0, padx=10, pady=10)
+    password_entry = tk.Entry(root, show="*")
+    password_entry.grid(row=1, column=1, padx=10, pady=10)
+    password_entry.insert(0,"")
+
+    # Login button that triggers the login function
+    login_button = tk.Button(root, text="Login", command=login)
+    login_button.grid(row=2, column=0, columnspan=2, pady=20)
+
+    root.mainloop()
+
+
+if __name__ == "__main__":
+    main()
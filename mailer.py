@@ -0,0 +1,270 @@
+# mailer.py  ───────────────────────────────────────────────────────────────
+"""
+Email every employee their own schedule for a finalized roster.
+
+Messages are sent by a small, bounded pool of worker threads.  Each worker
+opens ONE SMTP connection and reuses it for all the messages it sends
+(reconnecting only if the server drops it), so 100 staff cost a handful of
+TCP/TLS handshakes rather than 100.  Transient failures are retried with
+back-off; every recipient's outcome is written to ``mail_log``.
+
+SMTP settings come from the environment (like RUNNING_IN_DOCKER):
+    ROSTER_SMTP_HOST      (default localhost)
+    ROSTER_SMTP_PORT      (default 25)
+    ROSTER_SMTP_USER / ROSTER_SMTP_PASSWORD   (optional login)
+    ROSTER_SMTP_STARTTLS  "1" to upgrade with STARTTLS
+    ROSTER_SMTP_SSL       "1" for implicit TLS (port 465)
+    ROSTER_MAIL_FROM      (default roster@localhost)
+    ROSTER_SMTP_WORKERS   (default 4)
+
+Try it against a local stand-in server that just prints what it receives:
+    python -m aiosmtpd -n -l localhost:8025        # pip install aiosmtpd
+    ROSTER_SMTP_PORT=8025 python mailer.py send --roster 12
+test_mailer.py does the same automatically with an in-process stand-in:
+    python -m pytest -q test_mailer.py
+
+Each message carries the employee's personal PDF from employee_pdfs.py when
+it has been rendered, otherwise the store-wide roster PDF.
+
+Command line:
+    python mailer.py send --roster ID [--workers N] [--no-pdf]
+    python mailer.py log  --roster ID
+"""
+
+import os, time, queue, sqlite3, smtplib, threading, argparse
+from collections import namedtuple
+from email.message import EmailMessage
+from email.utils import make_msgid
+import roster_data
+import employee_pdfs
+import archive
+
+BASE_DIR    = os.path.dirname(os.path.abspath(__file__))
+DB_FILE     = os.path.join(BASE_DIR, "roster.db")
+ROSTERS_DIR = os.path.join(BASE_DIR, "Rosters")
+RETRIES     = 3          # attempts per message
+BACKOFF     = 0.5        # seconds, doubled after every failed attempt
+
+SmtpConfig = namedtuple("SmtpConfig", "host port user password starttls ssl sender workers")
+Result     = namedtuple("Result", "employee email status attempts error")
+
+
+def config_from_env():
+    env = os.environ.get
+    return SmtpConfig(
+        host     = env("ROSTER_SMTP_HOST", "localhost"),
+        port     = int(env("ROSTER_SMTP_PORT", "25")),
+        user     = env("ROSTER_SMTP_USER") or None,
+        password = env("ROSTER_SMTP_PASSWORD") or None,
+        starttls = env("ROSTER_SMTP_STARTTLS") == "1",
+        ssl      = env("ROSTER_SMTP_SSL") == "1",
+        sender   = env("ROSTER_MAIL_FROM", "roster@localhost"),
+        workers  = max(1, int(env("ROSTER_SMTP_WORKERS", "4"))),
+    )
+
+
+def ensure_schema(con):
+    """Create the per-recipient delivery log."""
+    con.execute("""
+        CREATE TABLE IF NOT EXISTS mail_log (
+            log_id    INTEGER PRIMARY KEY AUTOINCREMENT,
+            roster_id INTEGER,
+            employee  TEXT,
+            email     TEXT,
+            status    TEXT,        -- sent / failed / skipped
+            attempts  INTEGER,
+            error     TEXT,
+            logged_at TEXT DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    con.commit()
+
+
+# ─────────────────────────── message content ──────────────────────────────
+def render_schedule(employee, duties, total, start_date, end_date):
+    """Plain-text body of one employee's schedule."""
+    lines = [f"Hi {employee},", "",
+             f"Your shifts at BP Eltham for {start_date} to {end_date}:", ""]
+    for d in duties:
+        hrs = roster_data.duration_hours(d.start, d.end)
+        lines.append(f"  {roster_data.weekday(d.duty_date):<10} {d.duty_date}  "
+                     f"{d.start}-{d.end}  ({hrs:.1f} h)")
+        if d.note:
+            lines.append(f"  {'':<10} Note: {d.note}")
+    lines += ["", f"Weekly total: {total:.1f} h", "", "– BP Eltham roster"]
+    return "\n".join(lines)
+
+
+def build_message(cfg, to_addr, subject, body, attachments=()):
+    """``attachments``: ``[(filename, pdf bytes)]`` – see ``PdfCache``."""
+    msg = EmailMessage()
+    msg["From"], msg["To"], msg["Subject"] = cfg.sender, to_addr, subject
+    msg["Message-ID"] = make_msgid(domain="bp-roster")
+    msg.set_content(body)
+    for filename, data in attachments:
+        msg.add_attachment(data, maintype="application", subtype="pdf", filename=filename)
+    return msg
+
+
+class PdfCache(dict):
+    """path → (filename, bytes); each PDF is read once per run, however many recipients share it."""
+
+    def __missing__(self, path):
+        with open(path, "rb") as fh:
+            self[path] = (os.path.basename(path), fh.read())
+        return self[path]
+
+
+# ─────────────────────────── delivery ─────────────────────────────────────
+def _connect(cfg):
+    cls = smtplib.SMTP_SSL if cfg.ssl else smtplib.SMTP
+    conn = cls(cfg.host, cfg.port, timeout=30)
+    if cfg.starttls and not cfg.ssl:
+        conn.starttls()
+    if cfg.user:
+        conn.login(cfg.user, cfg.password or "")
+    return conn
+
+
+def _close(conn):
+    """QUIT politely; just drop the socket if the server is already gone."""
+    try:
+        conn.quit()
+    except Exception:
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+
+def _transient(err):
+    """Worth retrying?  4xx replies and dropped/refused connections are."""
+    if isinstance(err, smtplib.SMTPRecipientsRefused):
+        return all(400 <= code < 500 for code, _ in err.recipients.values())
+    if isinstance(err, smtplib.SMTPResponseException):
+        return 400 <= err.smtp_code < 500
+    return isinstance(err, (smtplib.SMTPServerDisconnected, OSError))
+
+
+def deliver(cfg, jobs, *, on_result=None):
+    """Send ``[(employee, EmailMessage), ...]`` through a pool of reused connections.
+
+    Returns a list of ``Result``; ``on_result`` is called (from worker threads)
+    as each recipient finishes.
+    """
+    work = queue.Queue()
+    for job in jobs:
+        work.put(job)
+    results, lock = [], threading.Lock()
+
+    def worker():
+        conn = None
+        try:
+            while True:
+                try:
+                    employee, msg = work.get_nowait()
+                except queue.Empty:
+                    return
+                err, attempt = None, 0
+                for attempt in range(1, RETRIES + 1):
+                    try:
+                        if conn is None:
+                            conn = _connect(cfg)
+                        conn.send_message(msg)
+                        err = None
+                        break
+                    except Exception as e:
+                        err = e
+                        if conn is not None and (isinstance(e, smtplib.SMTPServerDisconnected)
+                                                 or not isinstance(e, smtplib.SMTPException)):
+                            _close(conn); conn = None     # reconnect on the next attempt
+                        if not _transient(e) or attempt == RETRIES:
+                            break
+                        time.sleep(BACKOFF * 2 ** (attempt - 1))
+                res = Result(employee, msg["To"], "failed" if err else "sent",
+                             attempt, str(err) if err else None)
+                with lock:
+                    results.append(res)
+                if on_result:
+                    on_result(res)
+        finally:
+            if conn is not None:
+                _close(conn)
+
+    threads = [threading.Thread(target=worker, daemon=True)
+               for _ in range(min(cfg.workers, max(1, work.qsize())))]
+    for th in threads: th.start()
+    for th in threads: th.join()
+    return results
+
+
+def send_roster(roster_id, *, db_file=DB_FILE, cfg=None, attach_pdf=True, on_result=None):
+    """Email each employee on ``roster_id`` their schedule; log and return the results."""
+    cfg = cfg or config_from_env()
+    with archive.connect(db_file) as con:
+        ensure_schema(con)
+        bounds = roster_data.roster_bounds(con, roster_id)
+        if not bounds:
+            raise ValueError(f"No roster with id {roster_id}")
+        sd, ed = bounds
+        pdf = con.execute("SELECT pdf_file FROM all_roster WHERE roster_id=?", (roster_id,)).fetchone()[0]
+        pdf = os.path.join(ROSTERS_DIR, pdf) if pdf else None
+        attachments = [pdf] if attach_pdf and pdf and os.path.exists(pdf) else []
+        pdfs = PdfCache()
+        own_pdfs = employee_pdfs.rendered(roster_id) if attach_pdf else {}   # personal PDFs, if rendered
+
+        jobs, skipped = [], []
+        for employee, email, duties, total in roster_data.employee_schedules(con, roster_id):
+            if not email:
+                skipped.append(Result(employee, None, "skipped", 0, "no email address"))
+                continue
+            body = render_schedule(employee, duties, total, sd, ed)
+            own = own_pdfs.get(employee)
+            files = [own] if own and os.path.exists(own) else attachments
+            jobs.append((employee, build_message(cfg, email, f"Your BP Eltham shifts {sd} to {ed}",
+                                                 body, [pdfs[f] for f in files])))
+
+    for res in skipped:
+        if on_result: on_result(res)
+    results = skipped + deliver(cfg, jobs, on_result=on_result)
+    log_results(roster_id, results, db_file=db_file)
+    return results
+
+
+def log_results(roster_id, results, *, db_file=DB_FILE):
+    with sqlite3.connect(db_file) as con:
+        ensure_schema(con)
+        con.executemany("""INSERT INTO mail_log(roster_id,employee,email,status,attempts,error)
+                           VALUES(?,?,?,?,?,?)""",
+                        [(roster_id, r.employee, r.email, r.status, r.attempts, r.error)
+                         for r in results])
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Email personal schedules to staff")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    sp = sub.add_parser("send", help="send each employee their schedule")
+    sp.add_argument("--roster", type=int, required=True)
+    sp.add_argument("--workers", type=int, help="override ROSTER_SMTP_WORKERS")
+    sp.add_argument("--no-pdf", action="store_true", help="do not attach the roster PDF")
+    lp = sub.add_parser("log", help="show the delivery log for a roster")
+    lp.add_argument("--roster", type=int, required=True)
+    args = ap.parse_args()
+
+    if args.cmd == "send":
+        cfg = config_from_env()
+        if args.workers:
+            cfg = cfg._replace(workers=max(1, args.workers))
+        t0 = time.perf_counter()
+        res = send_roster(args.roster, cfg=cfg, attach_pdf=not args.no_pdf,
+                          on_result=lambda r: print(f"{r.status:<8} {r.employee} <{r.email}>"
+                                                    + (f"  ({r.error})" if r.error else "")))
+        sent = sum(r.status == "sent" for r in res)
+        print(f"[✔] {sent}/{len(res)} sent in {time.perf_counter() - t0:.1f}s")
+    else:
+        with sqlite3.connect(DB_FILE) as con:
+            ensure_schema(con)
+            for row in con.execute("""SELECT logged_at,status,employee,email,attempts,error
+                                        FROM mail_log WHERE roster_id=? ORDER BY log_id""",
+                                   (args.roster,)):
+                print(*[c if c is not None else "" for c in row], sep="  ")
@@ -25,10 +25,45 @@ def ensure_database():
         try:
             with sqlite3.connect(DB_PATH) as con:
                 con.execute("SELECT COUNT(*) FROM managers")
+                healthy = con.execute("PRAGMA quick_check").fetchone()[0] == "ok"
         except:
+            healthy = False
+        if not healthy and not offer_restore():
             # NOTE: Using setup_command list here
             subprocess.run(setup_command, check=True)
 
-ensure_database()
+# Damaged roster.db: restore the newest good snapshot from Backups/ if the user agrees
+def offer_restore():
+    import backup
+    snapshot = backup.latest_good(backup_dir=os.path.join(os.path.dirname(DB_PATH), "Backups"))
+    if not snapshot:
+        return False
+    import tkinter as tk
+    from tkinter import messagebox
+    root = tk.Tk(); root.withdraw()
+    try:
+        if not messagebox.askyesno(
+                "Database damaged",
+                "roster.db could not be read.\n\n"
+                f"Restore the backup from {os.path.basename(snapshot)}?\n"
+                "(The damaged file is kept as roster.db.broken-…)"):
+            return False
+        try:
+            backup.restore(snapshot, db_file=DB_PATH)
+        except Exception as e:
+            messagebox.showerror("Restore failed", str(e))
+            return False
+        return True
+    finally:
+        root.destroy()
+
+if __name__ == "__main__":
+    # process-pool workers (per-employee PDFs) re-import this module on
+    # Windows/macOS and in PyInstaller builds – they must not start the GUI
+    import multiprocessing
+    multiprocessing.freeze_support()
+
+    ensure_database()
 
-import login  # launch login GUI
+    import login  # launch login GUI
+    login.main()
@@ -1,8 +1,156 @@
 # pdf_generator.py  ─────────────────────────────────────────────────────────
+import os, io, datetime, multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from xml.sax.saxutils import escape
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import A4, landscape
 from reportlab.lib.styles import getSampleStyleSheet
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+from reportlab.pdfbase import pdfmetrics
+from reportlab.platypus import (SimpleDocTemplate, BaseDocTemplate, PageTemplate, Frame,
+                                Table, TableStyle, Paragraph, Spacer)
+
+class RosterRenderer:
+    """
+    Roster table → PDF, with everything that does not depend on the data built
+    once: stylesheet, the table styles, font metrics and the page template
+    (header with the site name, footer with generation time and page number).
+    The time is not part of the pdf_store hash, so a reused PDF keeps the time
+    it was first rendered – hence "First generated".
+
+        r = RosterRenderer()
+        r.render(table, "week.pdf", title="…")        # to a file
+        pdf_bytes = r.render_bytes(table, title="…")  # in memory
+        r.render_employee("Ann", rows, 38.5, "Ann.pdf")   # personal schedule (A4 portrait)
+
+    ``get_renderer()`` returns the per-process instance that
+    ``generate_roster_pdf`` uses.  One renderer draws one document at a time –
+    give each thread its own.
+    """
+
+    FONTS = ("Helvetica", "Helvetica-Bold", "Helvetica-Oblique")
+
+    def __init__(self, *, pagesize=landscape(A4), site="BP Eltham"):
+        self.pagesize, self.site = pagesize, site
+        self.margins = dict(rightMargin=20, leftMargin=20, topMargin=25, bottomMargin=25)
+        for name in self.FONTS:                      # load AFM metrics once
+            pdfmetrics.getFont(name)
+        sheet = getSampleStyleSheet()
+        self.title_style, self.body_style = sheet["Title"], sheet["BodyText"]
+
+        base = [
+            ('BACKGROUND', (0, 0), (-1, 0), colors.black),   # Header background color
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),     # Header text color
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),                 # Center align all cells
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),       # Bold header font
+            ('FONTSIZE', (0, 0), (-1, 0), 14),                     # Header font size
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black)            # Grid lines
+        ]
+        self.table_style = TableStyle(base)
+        # single-cell heading row: span it across the table
+        self.heading_style = TableStyle(base + [
+            ('SPAN', (0, 0), (-1, 0)),
+            ('BACKGROUND', (0, 0), (0, 0), colors.lightgrey),
+            ('ALIGN', (0, 0), (0, 0), 'CENTER'),
+            ('FONTSIZE', (0, 0), (0, 0), 12),
+            ('BOTTOMPADDING', (0, 0), (0, 0), 6),
+        ])
+        # personal schedule: Day | Date | Shift | Hours | Note, weekly total last
+        self.employee_style = TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.black),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),   # weekly total row
+            ('ALIGN', (0, 0), (-2, -1), 'CENTER'),
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black),
+        ])
+
+        w, h = pagesize
+        m = self.margins
+        self.frame = Frame(m["leftMargin"], m["bottomMargin"],
+                           w - m["leftMargin"] - m["rightMargin"],
+                           h - m["topMargin"] - m["bottomMargin"], id="body")
+        self.page_template = PageTemplate(id="roster", frames=[self.frame], onPage=self._decorate)
+
+    def _decorate(self, canvas, doc):
+        """Header + footer drawn on every page."""
+        w, h = self.pagesize
+        canvas.saveState()
+        canvas.setFont("Helvetica-Oblique", 8)
+        canvas.setFillColor(colors.grey)
+        canvas.drawString(20, h - 15, self.site)
+        canvas.drawString(20, 10, f"First generated {doc.generated_at}")
+        canvas.drawRightString(w - 20, 10, f"Page {doc.page}")
+        canvas.restoreState()
+
+    def _story(self, table_data, title):
+        story = []
+        if title:                                        # top‑of‑page title
+            story.append(Paragraph(f"<b>{title}</b>", self.title_style))
+            story.append(Spacer(1, 12))                  # 12 pt gap
+
+        # Detect a single‑cell title row (the patch in dashboard.py adds it)
+        first_row_is_heading = (
+            len(table_data) > 0
+            and len(set(map(len, table_data))) == 1      # all rows equal length
+            and any(table_data[0][1:]) is False          # only first cell populated
+        )
+        tbl = Table(table_data)
+        tbl.setStyle(self.heading_style if first_row_is_heading else self.table_style)
+        story.append(tbl)
+        return story
+
+    def render(self, table_data, target, *, title=None):
+        """Write one roster to ``target`` (file name or binary file object); returns ``target``."""
+        doc = BaseDocTemplate(target, pagesize=self.pagesize, title=title or "",
+                              pageTemplates=[self.page_template], **self.margins)
+        doc.generated_at = datetime.datetime.now().strftime("%Y-%m-%d %H:%M")
+        doc.build(self._story(table_data, title))
+        return target
+
+    def render_bytes(self, table_data, *, title=None):
+        buf = io.BytesIO()
+        self.render(table_data, buf, title=title)
+        return buf.getvalue()
+
+    def render_many(self, jobs):
+        """``[(table_data, target, title), …]`` → targets, all drawn by this renderer."""
+        return [self.render(table, target, title=title) for table, target, title in jobs]
+
+    def render_employee(self, employee, rows, total, target, *, title=None):
+        """One employee's schedule (see ``generate_employee_pdf``); returns ``target``."""
+        doc = SimpleDocTemplate(target, pagesize=A4,
+                                rightMargin=30, leftMargin=30, topMargin=30, bottomMargin=30)
+        story = [Paragraph(f"<b>{escape(employee)}</b>", self.title_style)]
+        if title:
+            story += [Paragraph(escape(title), self.body_style)]
+        story.append(Spacer(1, 12))
+
+        data = [["Day", "Date", "Shift", "Hours", "Note"]]
+        for wd, ds, shift, hrs, note in rows:
+            data.append([wd, ds, shift, f"{hrs:.1f}", Paragraph(escape(note or ""), self.body_style)])
+        if not rows:
+            data.append(["", "", "No shifts this week", "", ""])
+        data.append(["Weekly Total", "", "", f"{total:.1f} h", ""])
+
+        tbl = Table(data, colWidths=[80, 75, 90, 50, None], repeatRows=1)
+        tbl.setStyle(self.employee_style)
+        story.append(tbl)
+        doc.build(story)
+        return target
+
+
+_RENDERER = None
+
+def get_renderer():
+    """The renderer of this process (built on first use)."""
+    global _RENDERER
+    if _RENDERER is None:
+        _RENDERER = RosterRenderer()
+    return _RENDERER
+
 
 def generate_roster_pdf(table_data, *, filename, title=None):
     """
@@ -14,47 +162,43 @@ def generate_roster_pdf(table_data, *, filename, title=None):
     title      : str | None
         Optional document title; drawn in bold above the table.
     """
-    doc  = SimpleDocTemplate(
-        filename,
-        pagesize=landscape(A4),
-        rightMargin=20, leftMargin=20,
-        topMargin=25,  bottomMargin=25
-    )
-
-    story = []
-    styles = getSampleStyleSheet()
-
-    if title:                                        # top‑of‑page title
-        story.append(Paragraph(f"<b>{title}</b>", styles["Title"]))
-        story.append(Spacer(1, 12))                  # 12 pt gap
-
-    # Detect a single‑cell title row (the patch in dashboard.py adds it)
-    first_row_is_heading = (
-        len(table_data) > 0
-        and len(set(map(len, table_data))) == 1      # all rows equal length
-        and any(table_data[0][1:]) is False          # only first cell populated
-    )
-
-    tbl = Table(table_data)
-
-    ts  = TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.black),   # Header background color
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),     # Header text color
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),                 # Center align all cells
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),       # Bold header font
-        ('FONTSIZE', (0, 0), (-1, 0), 14),                     # Header font size
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black)            # Grid lines
-    ])
-
-    if first_row_is_heading:
-        n_cols = len(table_data[0])
-        ts.add("SPAN",  (0, 0), (n_cols - 1, 0))     # span the heading row
-        ts.add("BACKGROUND", (0, 0), (0, 0), colors.lightgrey)
-        ts.add("ALIGN",      (0, 0), (0, 0), "CENTER")
-        ts.add("FONTSIZE",   (0, 0), (0, 0), 12)
-        ts.add("BOTTOMPADDING", (0, 0), (0, 0), 6)
-
-    tbl.setStyle(ts)
-    story.append(tbl)
-    doc.build(story)
+    return get_renderer().render(table_data, filename, title=title)
+
+
+# ─────────────────────── per-employee schedules ───────────────────────────
+def generate_employee_pdf(employee, rows, total, *, filename, title=None):
+    """
+    employee : str
+    rows     : list[tuple[str, str, str, float, str]]
+        (weekday, date, "HH:MM-HH:MM", hours, note) – one per shift, in order.
+    total    : float   weekly hours
+    filename : str     target PDF file (will be overwritten)
+    title    : str | None   line drawn under the employee's name
+    """
+    return get_renderer().render_employee(employee, rows, total, filename, title=title)
+
+
+def _employee_job(job):
+    """Process-pool entry point: job is the kwargs of generate_employee_pdf."""
+    return generate_employee_pdf(**job)
+
+
+def generate_employee_pdfs(jobs, *, processes=None):
+    """
+    Render many per-employee PDFs, spread over a process pool.
+
+    jobs      : list[dict]   keyword arguments for generate_employee_pdf
+    processes : int | None   pool size (default: CPU count); 1 renders in-process
+    Returns the written file names in job order.
+    """
+    jobs = list(jobs)
+    processes = processes or os.cpu_count() or 1
+    if processes <= 1 or len(jobs) < 4:
+        return [_employee_job(j) for j in jobs]
+    workers = min(processes, len(jobs))
+    # spawn, not fork: the dashboard process has Tk and DB worker threads running
+    with ProcessPoolExecutor(max_workers=workers, initializer=get_renderer,
+                             mp_context=multiprocessing.get_context("spawn")) as pool:
+        # a few chunks per worker: low IPC overhead, still evenly balanced
+        chunk = max(1, len(jobs) // (workers * 4))
+        return list(pool.map(_employee_job, jobs, chunksize=chunk))
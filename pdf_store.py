@@ -0,0 +1,152 @@
+# pdf_store.py  ────────────────────────────────────────────────────────────
+"""
+Content-addressed store for roster PDFs.
+
+A PDF is keyed by the SHA-256 of the table data + title it is rendered from.
+Finalizing a roster whose rendered contents already exist reuses that file
+instead of rendering a new timestamped copy.  ``roster.pdf_file`` and
+``roster.pdf_hash`` record which artifact belongs to which roster, and
+``prune()`` removes files nothing refers to any more.
+
+Paths stored in the DB are relative to ``Rosters/`` so the same roster.db
+works on the host and inside the Docker container.
+
+Command line:
+    python pdf_store.py prune [--keep-days N] [--dry-run]
+"""
+
+import os, re, json, sqlite3, hashlib, datetime, argparse
+import pdf_generator
+
+BASE_DIR    = os.path.dirname(os.path.abspath(__file__))
+DB_FILE     = os.path.join(BASE_DIR, "roster.db")
+ROSTERS_DIR = os.path.join(BASE_DIR, "Rosters")
+KEEP_DAYS   = 30        # grace period before an unreferenced PDF is deleted
+ARTIFACT_RE = re.compile(r"roster_[0-9a-f]{16}\.pdf")   # names get_or_render gives its files
+
+
+def ensure_schema(con):
+    """Create the artifact table and add the hash column to older roster tables."""
+    con.execute("""
+        CREATE TABLE IF NOT EXISTS pdf_artifacts (
+            hash       TEXT PRIMARY KEY,   -- sha256 of rendered table + title
+            path       TEXT NOT NULL,      -- relative to Rosters/
+            created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+            last_used  TEXT DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    cols = [c[1] for c in con.execute("PRAGMA table_info(roster)")]
+    if cols and "pdf_hash" not in cols:
+        con.execute("ALTER TABLE roster ADD COLUMN pdf_hash TEXT")
+    con.commit()
+
+
+def content_hash(table_data, title=None):
+    """Stable digest of exactly what ends up on the page."""
+    payload = json.dumps({"title": title, "table": table_data},
+                         ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def abs_path(rel_path):
+    """Absolute location of a stored artifact."""
+    return os.path.join(ROSTERS_DIR, rel_path)
+
+
+def get_or_render(table_data, *, title=None, db_file=DB_FILE):
+    """Return ``(abs_path, digest, reused)`` for this table, rendering only if needed."""
+    digest = content_hash(table_data, title)
+    with sqlite3.connect(db_file) as con:
+        ensure_schema(con)
+        row = con.execute("SELECT path FROM pdf_artifacts WHERE hash=?", (digest,)).fetchone()
+        if row and os.path.exists(abs_path(row[0])):
+            con.execute("UPDATE pdf_artifacts SET last_used=CURRENT_TIMESTAMP WHERE hash=?", (digest,))
+            return abs_path(row[0]), digest, True
+
+        os.makedirs(ROSTERS_DIR, exist_ok=True)
+        rel = f"roster_{digest[:16]}.pdf"
+        tmp = abs_path(rel) + ".part"
+        pdf_generator.generate_roster_pdf(table_data, filename=tmp, title=title)
+        os.replace(tmp, abs_path(rel))              # never leave a half-written PDF
+        con.execute("""INSERT OR REPLACE INTO pdf_artifacts(hash,path,created_at,last_used)
+                       VALUES(?,?,CURRENT_TIMESTAMP,CURRENT_TIMESTAMP)""", (digest, rel))
+    return abs_path(rel), digest, False
+
+
+def attach(con, roster_id, path, digest):
+    """Record the artifact used by ``roster_id``."""
+    con.execute("UPDATE roster SET pdf_file=?,pdf_hash=? WHERE roster_id=?",
+                (os.path.relpath(path, ROSTERS_DIR), digest, roster_id))
+
+
+def prune(*, keep_days=KEEP_DAYS, dry_run=False, db_file=DB_FILE):
+    """Delete PDFs in Rosters/ that no roster refers to.
+
+    * artifacts not referenced by any roster and unused for ``keep_days``
+    * loose ``roster_<hash>.pdf`` files this store wrote but no longer indexes,
+      older than ``keep_days``
+    * artifact rows whose file has disappeared
+
+    Other PDFs – e.g. the timestamped rosters saved before the store existed,
+    whose rows have an empty ``pdf_file`` – are never touched: they may be
+    the only copy.  Only the top level of Rosters/ is scanned.  Returns the
+    removed paths.
+    """
+    cutoff = datetime.datetime.now() - datetime.timedelta(days=keep_days)
+    # last_used is written by SQLite's CURRENT_TIMESTAMP, i.e. in UTC
+    cutoff_s = (datetime.datetime.now(datetime.timezone.utc)
+                - datetime.timedelta(days=keep_days)).strftime("%Y-%m-%d %H:%M:%S")
+    removed = []
+    with sqlite3.connect(db_file) as con:
+        ensure_schema(con)
+        # archived rosters (archive.py) keep their PDF reference in roster_summary
+        sources = ["roster"] + [t for t, in con.execute(
+            "SELECT name FROM sqlite_master WHERE type='table' AND name='roster_summary'")]
+        rows = " UNION ".join(f"SELECT pdf_file,pdf_hash FROM {t}" for t in sources)
+        referenced = {os.path.normpath(p) for p, _h in con.execute(rows)
+                      if p}
+        # older rows stored absolute paths – normalise them to Rosters/-relative
+        referenced = {os.path.relpath(p, ROSTERS_DIR) if os.path.isabs(p) else p
+                      for p in referenced}
+        referenced |= {p for p, in con.execute(
+            f"SELECT a.path FROM pdf_artifacts a JOIN ({rows}) r ON r.pdf_hash=a.hash")}
+
+        stale = []
+        for digest, rel, last_used in con.execute(
+                "SELECT hash,path,last_used FROM pdf_artifacts").fetchall():
+            if not os.path.exists(abs_path(rel)):
+                stale.append(digest)
+            elif rel not in referenced and (last_used or "") < cutoff_s:
+                stale.append(digest); removed.append(abs_path(rel))
+        known = {p for p, in con.execute("SELECT path FROM pdf_artifacts")}
+
+        if os.path.isdir(ROSTERS_DIR):
+            for entry in os.scandir(ROSTERS_DIR):
+                if (entry.is_file() and ARTIFACT_RE.fullmatch(entry.name)
+                        and entry.name not in referenced and entry.name not in known
+                        and datetime.datetime.fromtimestamp(entry.stat().st_mtime) < cutoff):
+                    removed.append(entry.path)
+
+        if not dry_run:
+            con.executemany("DELETE FROM pdf_artifacts WHERE hash=?", [(h,) for h in stale])
+            for p in removed:
+                try:
+                    os.remove(p)
+                except OSError as e:
+                    print(f"Could not remove {p}: {e}")
+    return removed
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Roster PDF artifact store")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    pr = sub.add_parser("prune", help="delete PDFs no roster refers to")
+    pr.add_argument("--keep-days", type=int, default=KEEP_DAYS)
+    pr.add_argument("--dry-run", action="store_true")
+    args = ap.parse_args()
+
+    if args.cmd == "prune":
+        gone = prune(keep_days=args.keep_days, dry_run=args.dry_run)
+        for p in gone:
+            print(("would remove " if args.dry_run else "removed ") + p)
+        print(f"[✔] {len(gone)} file(s) {'to prune' if args.dry_run else 'pruned'}.")
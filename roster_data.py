@@ -0,0 +1,124 @@
+# roster_data.py  ──────────────────────────────────────────────────────────
+"""
+Small read helpers shared by the exporters, mailer and reports, plus the
+change counters (``data_epoch``) that read caches use to notice new data.
+
+Rows are streamed straight off the SQLite cursor – nothing here builds a
+list of a whole roster (or of the whole history).
+
+Queries go through the ``all_roster`` / ``all_roster_duties`` views, so pass
+a connection from ``archive.connect()``; archived rosters then read exactly
+like live ones.
+"""
+
+import os, re, datetime
+from collections import namedtuple
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DB_FILE  = os.path.join(BASE_DIR, "roster.db")
+
+Duty = namedtuple("Duty", "roster_id duty_date employee start end note")
+
+_ORDER = {
+    "date":     "roster_id, duty_date, start_time, employee",
+    "employee": "employee, duty_date, start_time, roster_id",
+}
+
+
+def minutes(hhmm):
+    """'06:45' → 405"""
+    h, m = hhmm.split(":")
+    return int(h) * 60 + int(m)
+
+
+def duration_hours(start, end):
+    """Length of a HH:MM–HH:MM shift in hours (wraps past midnight like the UI)."""
+    return ((minutes(end) - minutes(start)) % (24 * 60)) / 60
+
+
+def weekday(ds):
+    """'2025-01-05' → 'Sunday'"""
+    return datetime.date.fromisoformat(ds).strftime("%A")
+
+
+def iter_duties(con, roster_id=None, *, order="date"):
+    """Yield ``Duty`` rows for one roster (or every roster when ``roster_id`` is None)."""
+    sql = """SELECT roster_id,duty_date,employee,start_time,end_time,note
+               FROM all_roster_duties"""
+    args = ()
+    if roster_id is not None:
+        sql += " WHERE roster_id=?"; args = (roster_id,)
+    sql += " ORDER BY " + _ORDER[order]
+    for row in con.execute(sql, args):
+        yield Duty(*row)
+
+
+def roster_bounds(con, roster_id):
+    """(start_date, end_date) of a roster, or None."""
+    return con.execute("SELECT start_date,end_date FROM all_roster WHERE roster_id=?",
+                       (roster_id,)).fetchone()
+
+
+def safe_name(name):
+    """Employee name → something usable as a file name."""
+    return re.sub(r"[^\w.-]+", "_", name).strip("_") or "employee"
+
+
+def unique_stem(name, used):
+    """``safe_name(name)``, suffixed _2, _3 … while it clashes with ``used`` (case-insensitive).
+
+    Adds the result to ``used`` – "Ann B" and "Ann/B" must not share a file.
+    """
+    base = stem = safe_name(name)
+    n = 1
+    while stem.lower() in used:
+        n += 1; stem = f"{base}_{n}"
+    used.add(stem.lower())
+    return stem
+
+
+def file_stems(names):
+    """{name: unique file stem}, assigned in sorted order so every caller agrees."""
+    used = set()
+    return {n: unique_stem(n, used) for n in sorted(set(names))}
+
+
+def employee_schedules(con, roster_id):
+    """Yield ``(employee, email, [Duty, ...], total_hours)`` for everyone on the roster."""
+    emails = dict(con.execute("SELECT name,email FROM staff"))
+    current, duties = None, []
+    for d in iter_duties(con, roster_id, order="employee"):
+        if d.employee != current and duties:
+            yield current, emails.get(current), duties, _total(duties)
+            duties = []
+        current = d.employee
+        duties.append(d)
+    if duties:
+        yield current, emails.get(current), duties, _total(duties)
+
+
+def _total(duties):
+    return sum(duration_hours(d.start, d.end) for d in duties)
+
+
+# ─────────────── change counters for read caches (api_server.py) ──────────
+def ensure_epoch_schema(con):
+    con.execute("""
+        CREATE TABLE IF NOT EXISTS main.data_epoch (
+            scope TEXT PRIMARY KEY,     -- 'staff' / 'roster'
+            epoch INTEGER NOT NULL
+        )
+    """)
+
+
+def bump_epoch(con, *scopes):
+    """Mark ``scopes`` as changed; caller commits with its own transaction."""
+    ensure_epoch_schema(con)
+    for scope in scopes:
+        con.execute("""INSERT INTO data_epoch(scope,epoch) VALUES(?,1)
+                       ON CONFLICT(scope) DO UPDATE SET epoch=epoch+1""", (scope,))
+
+
+def read_epochs(con):
+    """{scope: epoch}"""
+    return dict(con.execute("SELECT scope,epoch FROM data_epoch"))
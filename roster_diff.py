@@ -0,0 +1,168 @@
+# roster_diff.py  ──────────────────────────────────────────────────────────
+"""
+What changed between two revisions of a roster?
+
+Each roster (or the unsaved week in the dashboard) is reduced to a dict keyed
+by ``(employee, date)`` whose value is that person's sorted shifts for the
+day.  Comparing two such dicts is one pass over the union of their keys, so
+the diff is linear in the number of duties:
+
+    added    – employee now works a day they did not work before
+    removed  – employee no longer works that day
+    changed  – same employee + day, different times
+
+``notify()`` emails a short change notice to the affected employees only,
+through the same pooled SMTP delivery as mailer.py.
+
+Command line:
+    python roster_diff.py show   NEW_ID [--base OLD_ID]   (default base: previous
+    python roster_diff.py notify NEW_ID [--base OLD_ID]    revision of the same week)
+"""
+
+import os, argparse
+from collections import namedtuple
+import archive
+import mailer
+import roster_data
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DB_FILE  = os.path.join(BASE_DIR, "roster.db")
+
+Change = namedtuple("Change", "employee date kind before after")   # before/after: ((start,end),…)
+
+
+# ─────────────────────────── keyed shift sets ─────────────────────────────
+def _keyed(pairs):
+    """[(employee, date, start, end)] → {(employee, date): ((start, end), …)}"""
+    out = {}
+    for emp, ds, st, et in pairs:
+        out.setdefault((emp, ds), []).append((st, et))
+    return {k: tuple(sorted(v)) for k, v in out.items()}
+
+
+def from_roster(con, roster_id):
+    """Keyed shifts of a saved roster (``con`` from ``archive.connect()``)."""
+    return _keyed((d.employee, d.duty_date, d.start, d.end)
+                  for d in roster_data.iter_duties(con, roster_id))
+
+
+def from_week(roster_duties):
+    """Keyed shifts of the dashboard's ``{date: [duty dict, …]}``."""
+    return _keyed((d["employee"], ds, d["start"], d["end"])
+                  for ds, lst in roster_duties.items() for d in lst)
+
+
+def previous_revision(con, roster_id=None, *, start_date=None):
+    """Latest roster for the same week saved before ``roster_id`` (or latest for ``start_date``)."""
+    if roster_id is None:
+        return con.execute("SELECT MAX(roster_id) FROM all_roster WHERE start_date=?",
+                           (start_date,)).fetchone()[0]
+    return con.execute("""SELECT MAX(o.roster_id) FROM all_roster o
+                           JOIN all_roster r ON r.roster_id=? AND o.start_date=r.start_date
+                          WHERE o.roster_id<r.roster_id""", (roster_id,)).fetchone()[0]
+
+
+# ─────────────────────────── diff ─────────────────────────────────────────
+def diff(old, new):
+    """[Change] sorted by date, employee – linear in len(old) + len(new)."""
+    changes = []
+    for key in old.keys() | new.keys():
+        a, b = old.get(key), new.get(key)
+        if a == b:
+            continue
+        kind = "added" if a is None else "removed" if b is None else "changed"
+        changes.append(Change(key[0], key[1], kind, a or (), b or ()))
+    changes.sort(key=lambda c: (c.date, c.employee.lower()))
+    return changes
+
+
+def by_employee(changes):
+    """{employee: [Change, …]} – the people a notice has to go to."""
+    out = {}
+    for c in changes:
+        out.setdefault(c.employee, []).append(c)
+    return out
+
+
+def _shifts(shifts):
+    return ", ".join(f"{s}-{e}" for s, e in shifts) or "off"
+
+
+def describe(c):
+    """One line: 'Tuesday 2025-01-07  Ann: 06:00-14:00 → 10:00-18:00'"""
+    return (f"{roster_data.weekday(c.date):<10} {c.date}  {c.employee}: "
+            f"{_shifts(c.before)} → {_shifts(c.after)}")
+
+
+def format_changes(changes):
+    if not changes:
+        return ["No shift changes."]
+    people = by_employee(changes)
+    return ([f"{len(changes)} change(s) for {len(people)} employee(s):", ""]
+            + [("+ " if c.kind == "added" else "- " if c.kind == "removed" else "~ ") + describe(c)
+               for c in changes])
+
+
+def render_notice(employee, changes, start_date, end_date):
+    """Plain-text change notice for one employee."""
+    lines = [f"Hi {employee},", "",
+             f"Your BP Eltham roster for {start_date} to {end_date} has changed:", ""]
+    for c in changes:
+        lines.append(f"  {roster_data.weekday(c.date):<10} {c.date}  "
+                     f"{_shifts(c.before)}  →  {_shifts(c.after)}")
+    lines += ["", "Your other shifts are unchanged.", "", "– BP Eltham roster"]
+    return "\n".join(lines)
+
+
+# ─────────────────────────── notification ─────────────────────────────────
+def compare(roster_id, base_id=None, *, db_file=DB_FILE):
+    """→ (base_id, [Change]) for a saved roster against ``base_id`` / its previous revision."""
+    with archive.connect(db_file) as con:
+        if base_id is None:
+            base_id = previous_revision(con, roster_id)
+        old = from_roster(con, base_id) if base_id is not None else {}
+        return base_id, diff(old, from_roster(con, roster_id))
+
+
+def notify(roster_id, base_id=None, *, db_file=DB_FILE, cfg=None, on_result=None):
+    """Email a change notice to each affected employee; log and return ``mailer.Result``s."""
+    cfg = cfg or mailer.config_from_env()
+    base_id, changes = compare(roster_id, base_id, db_file=db_file)
+    with archive.connect(db_file) as con:
+        sd, ed = roster_data.roster_bounds(con, roster_id)
+        emails = dict(con.execute("SELECT name,email FROM staff"))
+
+    jobs, skipped = [], []
+    for employee, own in by_employee(changes).items():
+        email = emails.get(employee)
+        if not email:
+            skipped.append(mailer.Result(employee, None, "skipped", 0, "no email address"))
+            continue
+        jobs.append((employee, mailer.build_message(
+            cfg, email, f"Roster change {sd} to {ed}", render_notice(employee, own, sd, ed))))
+
+    for res in skipped:
+        if on_result: on_result(res)
+    results = skipped + mailer.deliver(cfg, jobs, on_result=on_result)
+    mailer.log_results(roster_id, results, db_file=db_file)
+    return results
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Compare roster revisions / notify affected staff")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    for name, hlp in (("show", "list shift changes"), ("notify", "email affected employees only")):
+        p = sub.add_parser(name, help=hlp)
+        p.add_argument("roster", type=int)
+        p.add_argument("--base", type=int, help="roster to compare against")
+    args = ap.parse_args()
+
+    if args.cmd == "show":
+        base, changes = compare(args.roster, args.base)
+        print(f"roster {base} → {args.roster}" if base else f"roster {args.roster} (no earlier revision)")
+        print("\n".join(format_changes(changes)))
+    else:
+        res = notify(args.roster, args.base,
+                     on_result=lambda r: print(f"{r.status:<8} {r.employee} <{r.email}>"
+                                               + (f"  ({r.error})" if r.error else "")))
+        print(f"[✔] {sum(r.status == 'sent' for r in res)}/{len(res)} change notices sent")
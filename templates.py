@@ -0,0 +1,201 @@
+# templates.py  ────────────────────────────────────────────────────────────
+"""
+Named, versioned roster templates ("Summer weekday", "School holidays", …).
+
+A template is stored once per version in ``roster_template`` as JSON that is
+already in the shape the roster tab needs:
+
+    {"duties": {"Monday": [["Ann", 360, 870], ...], ...},   # minutes from midnight
+     "notes":  {"Monday": "Fuel delivery 9am", ...}}
+
+so applying one to any start date is a dictionary copy – no per-row date
+parsing.  The latest version of every template is cached in memory; saving an
+unchanged template does not create a new version.
+
+Command line:
+    python templates.py list
+    python templates.py show NAME [--version N]
+    python templates.py diff NAME [--from N] [--to N]     (default: previous → latest)
+"""
+
+import os, json, sqlite3, datetime, argparse
+from collections import Counter
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DB_FILE  = os.path.join(BASE_DIR, "roster.db")
+DAYNAMES = ["Sunday", "Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday"]
+
+_cache = {}      # db_file → {name: (version, body)}  (latest versions only)
+
+
+def ensure_schema(con):
+    con.execute("""
+        CREATE TABLE IF NOT EXISTS roster_template (
+            template_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name        TEXT NOT NULL,
+            version     INTEGER NOT NULL,
+            body        TEXT NOT NULL,     -- JSON, see module docstring
+            created_at  TEXT DEFAULT CURRENT_TIMESTAMP,
+            UNIQUE (name, version)
+        )
+    """)
+    con.commit()
+
+
+# ─────────────────────────── conversion ───────────────────────────────────
+def _mins(hhmm):
+    h, m = hhmm.split(":")
+    return int(h) * 60 + int(m)
+
+
+def _hhmm(mins):
+    return f"{mins // 60:02d}:{mins % 60:02d}"
+
+
+def week_dates(start_date):
+    """[(date_str, weekday_name)] for the 7 days from ``start_date`` (a date)."""
+    first = (start_date.weekday() + 1) % 7          # Monday=0 → Sunday-first index
+    return [((start_date + datetime.timedelta(days=i)).isoformat(), DAYNAMES[(first + i) % 7])
+            for i in range(7)]
+
+
+def capture(duties, notes, start_date):
+    """Template body from the roster tab's weekday duties + per-date notes."""
+    body = {"duties": {wd: [[d["employee"], _mins(d["start"]), _mins(d["end"])]
+                            for d in duties.get(wd, [])] for wd in DAYNAMES if duties.get(wd)},
+            "notes": {}}
+    for ds, wd in week_dates(start_date):
+        if notes.get(ds):
+            body["notes"][wd] = notes[ds]
+    return body
+
+
+def apply(body, start_date):
+    """→ (weekday duties, per-date notes) ready for ``DraftJournal.replace``."""
+    duties = {wd: [{"employee": e, "start": _hhmm(s), "end": _hhmm(t)}
+                   for e, s, t in body["duties"].get(wd, [])] for wd in DAYNAMES}
+    notes = {ds: body["notes"].get(wd, "") for ds, wd in week_dates(start_date)}
+    return duties, notes
+
+
+# ─────────────────────────── storage + cache ──────────────────────────────
+def _latest(db_file):
+    if db_file not in _cache:
+        with sqlite3.connect(db_file) as con:
+            ensure_schema(con)
+            rows = con.execute("""SELECT t.name,t.version,t.body FROM roster_template t
+                                   WHERE t.version=(SELECT MAX(version) FROM roster_template
+                                                     WHERE name=t.name)""").fetchall()
+        _cache[db_file] = {n: (v, json.loads(b)) for n, v, b in rows}
+    return _cache[db_file]
+
+
+def names(*, db_file=DB_FILE):
+    return sorted(_latest(db_file), key=str.lower)
+
+
+def get(name, version=None, *, db_file=DB_FILE):
+    """Template body (latest version unless ``version`` is given), or None."""
+    latest = _latest(db_file).get(name)
+    if latest and (version is None or version == latest[0]):
+        return latest[1]
+    if version is None:
+        return None
+    with sqlite3.connect(db_file) as con:
+        row = con.execute("SELECT body FROM roster_template WHERE name=? AND version=?",
+                          (name, version)).fetchone()
+    return json.loads(row[0]) if row else None
+
+
+def versions(name, *, db_file=DB_FILE):
+    """[(version, created_at)] oldest first."""
+    with sqlite3.connect(db_file) as con:
+        ensure_schema(con)
+        return con.execute("""SELECT version,created_at FROM roster_template
+                               WHERE name=? ORDER BY version""", (name,)).fetchall()
+
+
+def save(name, body, *, db_file=DB_FILE):
+    """Store ``body`` as the next version of ``name``; returns the version in effect."""
+    name = name.strip()
+    if not name:
+        raise ValueError("Template name is required")
+    latest = _latest(db_file).get(name)
+    if latest and latest[1] == body:
+        return latest[0]                       # unchanged – no new version
+    version = latest[0] + 1 if latest else 1
+    with sqlite3.connect(db_file) as con:
+        con.execute("INSERT INTO roster_template(name,version,body) VALUES(?,?,?)",
+                    (name, version, json.dumps(body, ensure_ascii=False)))
+    _cache[db_file][name] = (version, body)
+    return version
+
+
+# ─────────────────────────── diff ─────────────────────────────────────────
+def diff(old, new):
+    """{weekday: {"added": [...], "removed": [...], "note": (old, new)}} – changed days only.
+
+    Shifts are compared as (employee, start, end) multisets per weekday.
+    """
+    out = {}
+    for wd in DAYNAMES:
+        a = Counter(tuple(x) for x in old["duties"].get(wd, []))
+        b = Counter(tuple(x) for x in new["duties"].get(wd, []))
+        entry = {}
+        if b - a: entry["added"] = sorted((b - a).elements())
+        if a - b: entry["removed"] = sorted((a - b).elements())
+        na, nb = old["notes"].get(wd, ""), new["notes"].get(wd, "")
+        if na != nb:
+            entry["note"] = (na, nb)
+        if entry:
+            out[wd] = entry
+    return out
+
+
+def format_diff(changes):
+    """Human-readable lines for ``diff()`` output."""
+    if not changes:
+        return ["No differences."]
+    lines = []
+    for wd, ch in changes.items():
+        lines.append(f"{wd}:")
+        for e, s, t in ch.get("removed", []):
+            lines.append(f"  - {e} {_hhmm(s)}-{_hhmm(t)}")
+        for e, s, t in ch.get("added", []):
+            lines.append(f"  + {e} {_hhmm(s)}-{_hhmm(t)}")
+        if "note" in ch:
+            lines.append(f"  note: {ch['note'][0]!r} → {ch['note'][1]!r}")
+    return lines
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Roster templates")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    sub.add_parser("list")
+    sp = sub.add_parser("show"); sp.add_argument("name"); sp.add_argument("--version", type=int)
+    dp = sub.add_parser("diff"); dp.add_argument("name")
+    dp.add_argument("--from", dest="v_from", type=int); dp.add_argument("--to", dest="v_to", type=int)
+    args = ap.parse_args()
+
+    if args.cmd == "list":
+        for n in names():
+            vs = versions(n)
+            print(f"{n}  (v{vs[-1][0]}, {vs[-1][1]})")
+    elif args.cmd == "show":
+        body = get(args.name, args.version)
+        if body is None:
+            raise SystemExit(f"No template {args.name!r}")
+        for wd in DAYNAMES:
+            shifts = ", ".join(f"{e} {_hhmm(s)}-{_hhmm(t)}" for e, s, t in body["duties"].get(wd, []))
+            print(f"{wd:<10} {shifts or '-'}" + (f"   [{body['notes'][wd]}]" if body["notes"].get(wd) else ""))
+    else:
+        vs = [v for v, _ in versions(args.name)]
+        if not vs:
+            raise SystemExit(f"No template {args.name!r}")
+        for v in (args.v_from, args.v_to):
+            if v is not None and v not in vs:
+                raise SystemExit(f"No version {v} of {args.name!r}")
+        v_to = args.v_to or vs[-1]
+        v_from = args.v_from or (vs[vs.index(v_to) - 1] if vs.index(v_to) > 0 else v_to)
+        print(f"{args.name}: v{v_from} → v{v_to}")
+        print("\n".join(format_diff(diff(get(args.name, v_from), get(args.name, v_to)))))
@@ -0,0 +1,160 @@
+# test_mailer.py  ──────────────────────────────────────────────────────────
+"""
+mailer.send_roster against an in-process stand-in SMTP server.
+
+The server is a few lines of socketserver speaking just enough SMTP for
+smtplib (EHLO/HELO, MAIL, RCPT, DATA, RSET, NOOP, QUIT) and keeping every
+message it accepts – no network, no aiosmtpd needed.
+
+Command line:
+    python -m pytest -q test_mailer.py        (or: python -m unittest test_mailer)
+"""
+
+import os, sqlite3, tempfile, threading, socketserver, unittest
+from email import message_from_bytes, policy
+from unittest import mock
+import database
+import archive
+import employee_pdfs
+import mailer
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    def reply(self, line):
+        self.wfile.write(line.encode() + b"\r\n")
+
+    def handle(self):
+        self.server.connections += 1
+        self.reply("220 stand-in ready")
+        sender, rcpts = None, []
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            cmd = line.decode().strip().upper()
+            if cmd.startswith(("EHLO", "HELO")):
+                self.reply("250 stand-in")
+            elif cmd.startswith("MAIL FROM:"):
+                sender, rcpts = line.decode().strip()[10:], []
+                self.reply("250 OK")
+            elif cmd.startswith("RCPT TO:"):
+                rcpts.append(line.decode().strip()[8:].strip("<>"))
+                self.reply("250 OK")
+            elif cmd == "DATA":
+                self.reply("354 end with <CRLF>.<CRLF>")
+                data = []
+                for raw in iter(self.rfile.readline, b""):
+                    if raw == b".\r\n":
+                        break
+                    data.append(raw[1:] if raw.startswith(b"..") else raw)
+                with self.server.lock:
+                    self.server.messages.append((sender, rcpts, b"".join(data)))
+                self.reply("250 queued")
+            elif cmd in ("RSET", "NOOP"):
+                self.reply("250 OK")
+            elif cmd == "QUIT":
+                self.server.quits += 1
+                self.reply("221 bye")
+                return
+            else:
+                self.reply("502 not implemented")
+
+
+class StandInSMTP(socketserver.ThreadingTCPServer):
+    daemon_threads, allow_reuse_address = True, True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _SMTPHandler)
+        self.messages, self.lock = [], threading.Lock()
+        self.connections = self.quits = 0
+
+    def __enter__(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown(); self.server_close()
+
+
+STAFF = [("Ann", "ann@example.com"), ("Bob", "bob@example.com"), ("Cy", "")]
+DUTIES = [("2025-01-05", "Ann", "06:00", "14:00"), ("2025-01-06", "Ann", "06:00", "14:00"),
+          ("2025-01-05", "Bob", "14:00", "22:00"), ("2025-01-07", "Cy", "06:00", "12:00")]
+
+
+class SendRosterTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db = os.path.join(self.tmp.name, "roster.db")
+        rosters = os.path.join(self.tmp.name, "Rosters")
+        os.makedirs(rosters)
+        with sqlite3.connect(self.db) as con:
+            database.create_tables(con)
+            con.executemany("INSERT INTO staff(name,email) VALUES(?,?)", STAFF)
+            con.execute("""INSERT INTO roster(roster_id,start_date,end_date,pdf_file)
+                           VALUES(1,'2025-01-05','2025-01-11','roster_1.pdf')""")
+            con.executemany("""INSERT INTO roster_duties(roster_id,duty_date,employee,start_time,end_time)
+                               VALUES(1,?,?,?,?)""", DUTIES)
+        con.close()
+        archive.setup(self.db)
+        with open(os.path.join(rosters, "roster_1.pdf"), "wb") as fh:
+            fh.write(b"%PDF-1.4 whole roster")
+        for p in (mock.patch.object(mailer, "ROSTERS_DIR", rosters),
+                  mock.patch.object(employee_pdfs, "ROSTERS_DIR", rosters)):
+            p.start(); self.addCleanup(p.stop)
+        own = os.path.join(employee_pdfs.roster_folder(1), "Bob.pdf")   # Bob has a personal PDF, Ann does not
+        os.makedirs(os.path.dirname(own))
+        with open(own, "wb") as fh:
+            fh.write(b"%PDF-1.4 Bob only")
+        employee_pdfs.write_index(1, {"Bob": own})
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_each_recipient_gets_one_message_and_the_run_is_logged(self):
+        with StandInSMTP() as server:
+            cfg = mailer.config_from_env()._replace(host="127.0.0.1", port=server.server_address[1],
+                                                    user=None, starttls=False, ssl=False, workers=2)
+            results = mailer.send_roster(1, db_file=self.db, cfg=cfg)
+
+        self.assertEqual(sorted((r.employee, r.status) for r in results),
+                         [("Ann", "sent"), ("Bob", "sent"), ("Cy", "skipped")])
+        self.assertEqual(sorted(r for _, rcpts, _ in server.messages for r in rcpts),
+                         ["ann@example.com", "bob@example.com"])
+        self.assertEqual(server.quits, server.connections)          # every connection closed cleanly
+
+        got = {}
+        for _, rcpts, raw in server.messages:
+            msg = message_from_bytes(raw, policy=policy.default)
+            got[rcpts[0]] = [(a.get_filename(), a.get_content()) for a in msg.iter_attachments()]
+        self.assertEqual(got["ann@example.com"], [("roster_1.pdf", b"%PDF-1.4 whole roster")])
+        self.assertEqual(got["bob@example.com"], [("Bob.pdf", b"%PDF-1.4 Bob only")])
+
+        with sqlite3.connect(self.db) as con:
+            log = sorted(con.execute("SELECT employee,email,status,attempts FROM mail_log WHERE roster_id=1"))
+        con.close()
+        self.assertEqual(log, [("Ann", "ann@example.com", "sent", 1),
+                               ("Bob", "bob@example.com", "sent", 1),
+                               ("Cy", None, "skipped", 0)])
+
+    def test_each_pdf_is_read_once_per_run(self):
+        opened = []
+        real_open = open
+        def counting_open(path, *a, **kw):
+            if str(path).endswith(".pdf"):
+                opened.append(os.path.basename(path))
+            return real_open(path, *a, **kw)
+        with sqlite3.connect(self.db) as con:                      # a second employee on the shared PDF
+            con.execute("INSERT INTO staff(name,email) VALUES('Di','di@example.com')")
+            con.execute("""INSERT INTO roster_duties(roster_id,duty_date,employee,start_time,end_time)
+                           VALUES(1,'2025-01-08','Di','06:00','14:00')""")
+        con.close()
+        with StandInSMTP() as server, mock.patch("builtins.open", counting_open):
+            cfg = mailer.config_from_env()._replace(host="127.0.0.1", port=server.server_address[1],
+                                                    user=None, starttls=False, ssl=False, workers=1)
+            mailer.send_roster(1, db_file=self.db, cfg=cfg)
+        self.assertEqual(len(server.messages), 3)
+        self.assertEqual(sorted(opened), ["Bob.pdf", "roster_1.pdf"])
+
+
+if __name__ == "__main__":
+    unittest.main()